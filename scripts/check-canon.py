@@ -3,38 +3,92 @@ Check that the canonicalization of the buyables stock is correct.
 
 Usage:
 
-uv run scripts/check-canon.py
+uv run scripts/check-canon.py [--write]
+
+With --write, the canonical stock is saved to buyables-stock-canon.txt next to the input.
 
 """
 
+import argparse
+import os
+from collections.abc import Iterable
+from multiprocessing import Pool
 from pathlib import Path
 
 from tqdm import tqdm
 
 from ursa.domain.chem import canonicalize_smiles
 from ursa.exceptions import InvalidSmilesError
+from ursa.utils.smiles_cache import SmilesCache
 
-data_path = Path(__name__).resolve().parent / "data" / "models" / "assets"
+base_dir = Path(__file__).resolve().parents[1]
+data_path = base_dir / "data" / "models" / "assets"
+cache_path = base_dir / "data" / "cache" / "smiles.sqlite"
 
-buyable_lines = (data_path / "buyables-stock.txt").read_text().splitlines()
 
-old_smi = set()
-canon_smi = set()
-invalid = set()
-pbar = tqdm(buyable_lines, unit="smiles")
-for line in pbar:
-    smiles = line.split(" ")[0]
-    old_smi.add(smiles)
+def _try_canonicalize(smiles: str) -> tuple[str, str | None]:
+    """Returns (smiles, canonical) or (smiles, None) so workers never raise across the pool boundary."""
     try:
-        canon_smi.add(canonicalize_smiles(smiles))
+        return smiles, canonicalize_smiles(smiles)
     except InvalidSmilesError:
-        invalid.add(smiles)
-    pbar.set_postfix({"canon_smi": len(canon_smi), "invalid": len(invalid)})
+        return smiles, None
+
+
+def write_smiles(smiles: Iterable[str], path: Path) -> None:
+    """Writes SMILES one per line in sorted order, streaming through a large buffer instead of one joined string."""
+    with open(path, "wb", buffering=8 << 20) as f:
+        for smi in sorted(smiles):
+            f.write(smi.encode())
+            f.write(b"\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check canonicalization of the buyables stock.")
+    parser.add_argument("--write", action="store_true", help="Save the canonical stock to buyables-stock-canon.txt")
+    args = parser.parse_args()
+
+    buyable_lines = (data_path / "buyables-stock.txt").read_text().splitlines()
+
+    # vendors aggregate the same compound many times; canonicalize each raw string only once
+    old_smi = {line.split(" ")[0] for line in buyable_lines}
+    canon_smi = set()
+    invalid = set()
+    with SmilesCache(cache_path) as cache:
+        # only send SMILES that no previous run has seen to the pool
+        misses = []
+        for smiles in old_smi:
+            try:
+                canon = cache.get(smiles)
+            except InvalidSmilesError:
+                invalid.add(smiles)
+                continue
+            if canon is None:
+                misses.append(smiles)
+            else:
+                canon_smi.add(canon)
+        print(f"Cache hits: {len(old_smi) - len(misses)}, misses: {len(misses)}")
+
+        with Pool(processes=os.cpu_count()) as pool:
+            results = pool.imap_unordered(_try_canonicalize, misses, chunksize=512)
+            pbar = tqdm(results, total=len(misses), unit="smiles", mininterval=0.5, smoothing=0.1)
+            for i, (smiles, canon) in enumerate(pbar):
+                cache.put(smiles, canon)
+                if canon is None:
+                    invalid.add(smiles)
+                else:
+                    canon_smi.add(canon)
+                # formatting the postfix on every item costs more than canonicalizing short SMILES
+                if (i & 1023) == 0:
+                    pbar.set_postfix({"canon_smi": len(canon_smi), "invalid": len(invalid)}, refresh=False)
+            pbar.set_postfix({"canon_smi": len(canon_smi), "invalid": len(invalid)})
+
+    print(f"Old: {len(old_smi)}")
+    print(f"Canon: {len(canon_smi)}")
+    print(f"Canon & Old: {len(canon_smi & old_smi)}")
 
-print(f"Old: {len(old_smi)}")
-print(f"Canon: {len(canon_smi)}")
-print(f"Canon & Old: {len(canon_smi & old_smi)}")
+    if args.write:
+        write_smiles(canon_smi, data_path / "buyables-stock-canon.txt")
 
 
-# with open(data_path / "buyables-stock-canon.txt", "w") as f:
-#     f.write("\n".join(sorted(canon_smi)))
+if __name__ == "__main__":
+    main()
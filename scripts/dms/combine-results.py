@@ -12,7 +12,7 @@ import argparse
 import json
 from pathlib import Path
 
-from ursa.io import load_json_gz, save_json_gz
+from ursa.io import load_json_gz_many, save_json_gz
 
 
 def combine_results(parent_dir: Path, base_name: str, parts: list[str]) -> None:
@@ -43,6 +43,7 @@ def combine_results(parent_dir: Path, base_name: str, parts: list[str]) -> None:
     print(f"Combining results for {base_name} from {len(parts)} parts...")
 
     # Process each part
+    gz_files: dict[str, list[Path]] = {"valid": [], "buyable": [], "emol": []}
     for part in parts:
         part_dir = parent_dir / f"{base_name}-{part}"
 
@@ -62,23 +63,21 @@ def combine_results(parent_dir: Path, base_name: str, parts: list[str]) -> None:
                 total_emol_solved += part_results.get("emol_solved_count", 0)
                 total_time_elapsed += part_results.get("time_elapsed", 0.0)
 
-        # Load valid_results
-        valid_file = part_dir / "valid_results.json.gz"
-        if valid_file.exists():
-            part_valid = load_json_gz(valid_file)
-            combined_valid_results.update(part_valid)
-
-        # Load buyable_results
-        buyable_file = part_dir / "buyable_results.json.gz"
-        if buyable_file.exists():
-            part_buyable = load_json_gz(buyable_file)
-            combined_buyable_results.update(part_buyable)
-
-        # Load emol_results
-        emol_file = part_dir / "emol_results.json.gz"
-        if emol_file.exists():
-            part_emol = load_json_gz(emol_file)
-            combined_emol_results.update(part_emol)
+        # Collect valid/buyable/emol results, they are loaded together below
+        for kind, files in gz_files.items():
+            gz_file = part_dir / f"{kind}_results.json.gz"
+            if gz_file.exists():
+                files.append(gz_file)
+
+    # Load every part file concurrently, then merge in part order so later parts still win on key clashes
+    all_files = [*gz_files["valid"], *gz_files["buyable"], *gz_files["emol"]]
+    loaded = dict(zip(all_files, load_json_gz_many(all_files), strict=True))
+    for gz_file in gz_files["valid"]:
+        combined_valid_results.update(loaded[gz_file])
+    for gz_file in gz_files["buyable"]:
+        combined_buyable_results.update(loaded[gz_file])
+    for gz_file in gz_files["emol"]:
+        combined_emol_results.update(loaded[gz_file])
 
     # Save combined results
     combined_results = {
@@ -1,22 +1,22 @@
 import argparse
-import json
+import ast
 import time
 from pathlib import Path
 
+import torch
 from directmultistep.generate import create_beam_search, load_published_model, prepare_input_tensors
 from directmultistep.model import ModelFactory
 from directmultistep.utils.dataset import RoutesProcessing
 from directmultistep.utils.logging_config import logger
 from directmultistep.utils.post_process import (
     canonicalize_paths,
-    find_path_strings_with_commercial_sm,
     find_valid_paths,
     remove_repetitions_within_beam_result,
 )
-from directmultistep.utils.pre_process import canonicalize_smiles
+from directmultistep.utils.pre_process import canonicalize_smiles, find_leaves
 from tqdm import tqdm
 
-from ursa.io import load_targets_csv, save_json_gz
+from ursa.io import load_targets_csv, save_json, save_json_gz
 
 base_dir = Path(__file__).resolve().parents[2]
 
@@ -31,6 +31,9 @@ if __name__ == "__main__":
     parser.add_argument("--model-name", type=str, required=True, help="Name of the model")
     parser.add_argument("--ckpt-path", type=Path, help="path to the checkpoint file (if not using a published model)")
     parser.add_argument("--use_fp16", action="store_true", help="Whether to use FP16")
+    parser.add_argument(
+        "--allow-tf32", action="store_true", help="Run FP32 matmuls on TF32 tensor cores (Ampere+, slightly lossy)"
+    )
     parser.add_argument("--device", type=str, default="cuda", help="Device to use for model inference")
     parser.add_argument("--target-name", type=str, required=True, help="Name of the target")
     desired_device = parser.parse_args().device
@@ -66,43 +69,43 @@ if __name__ == "__main__":
     emol_solved_count = 0
 
     device = ModelFactory.determine_device(desired_device)
+    if args.allow_tf32:
+        # --use_fp16 already halves the weights and inputs and attention goes through SDPA,
+        # so the only remaining tensor-core win is letting the FP32 path use TF32.
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
     rds = RoutesProcessing(metadata_path=dms_dir / "dms_dictionary.yaml")
     model = load_published_model(args.model_name, dms_dir / "checkpoints", args.use_fp16, device=desired_device)
 
     beam_obj = create_beam_search(model, 50, rds)
 
-    for target_key, target_smiles in tqdm(targets.items()):
-        target = canonicalize_smiles(target_smiles)
+    # explorer models are trained without a step count, so they decode once per target;
+    # every other model is prompted once for each route length from 2 to 8.
+    step_counts: list[int | None] = [None] if args.model_name.startswith("explorer") else list(range(2, 9))
 
+    # canonicalize all targets up front so the loop below only does model work
+    canon_targets = {target_key: canonicalize_smiles(target_smiles) for target_key, target_smiles in targets.items()}
+
+    # decoding stays at batch size 1 on purpose: the path start embeds the target SMILES, so prompts differ in length
+    # across targets, and BeamSearch.decode regroups active beams with view(B, -1, L), which assumes every batch item
+    # has the same number of finished beams. batching targets (or step counts) would silently mix beams between items.
+    for target_key, target in tqdm(canon_targets.items()):
         # this holds all beam search outputs for a SINGLE target, across multiple step calls
         all_beam_results_for_target_NS2: list[list[tuple[str, float]]] = []
 
-        if args.model_name == "explorer XL" or args.model_name == "explorer":
+        for step in step_counts:
             encoder_inp, steps_tens, path_tens = prepare_input_tensors(
-                target, None, None, rds, rds.product_max_length, rds.sm_max_length, args.use_fp16
+                target, step, None, rds, rds.product_max_length, rds.sm_max_length, args.use_fp16
             )
-            device = ModelFactory.determine_device()
-            beam_result_bs2 = beam_obj.decode(
-                src_BC=encoder_inp.to(device),
-                steps_B1=steps_tens.to(device) if steps_tens is not None else None,
-                path_start_BL=path_tens.to(device),
-                progress_bar=False,
-            )  # list[list[tuple[str, float]]]
-            all_beam_results_for_target_NS2.extend(beam_result_bs2)
-        else:
-            for step in range(2, 9):
-                encoder_inp, steps_tens, path_tens = prepare_input_tensors(
-                    target, step, None, rds, rds.product_max_length, rds.sm_max_length, args.use_fp16
-                )
-                device = ModelFactory.determine_device()
+            # inference_mode also skips autograd's version counters and view tracking, unlike no_grad
+            with torch.inference_mode():
                 beam_result_bs2 = beam_obj.decode(
                     src_BC=encoder_inp.to(device),
                     steps_B1=steps_tens.to(device) if steps_tens is not None else None,
                     path_start_BL=path_tens.to(device),
                     progress_bar=False,
                 )  #  list[list[tuple[str, float]]]
-
-                all_beam_results_for_target_NS2.extend(beam_result_bs2)
+            all_beam_results_for_target_NS2.extend(beam_result_bs2)
 
         valid_paths_per_batch = find_valid_paths(all_beam_results_for_target_NS2)
 
@@ -116,8 +119,14 @@ if __name__ == "__main__":
         # unwrap the single batch from the result
         raw_paths = [beam_result[0] for beam_result in unique_paths_NS2n[0]]
 
-        buyables_paths = find_path_strings_with_commercial_sm(raw_paths, commercial_stock=buyables_stock_set)
-        emol_paths = find_path_strings_with_commercial_sm(raw_paths, commercial_stock=emol_stock_set)
+        # parse every path and collect its starting materials once, then check both stocks against the same leaves.
+        # (find_path_strings_with_commercial_sm would re-parse each path for every stock.)
+        parsed_paths = [ast.literal_eval(p) for p in raw_paths]
+        path_leaves = [set(find_leaves(path)) for path in parsed_paths]
+        buyables_paths = [
+            path for path, leaves in zip(parsed_paths, path_leaves, strict=True) if leaves <= buyables_stock_set
+        ]
+        emol_paths = [path for path, leaves in zip(parsed_paths, path_leaves, strict=True) if leaves <= emol_stock_set]
 
         raw_solved_count += bool(raw_paths)
         buyable_solved_count += bool(buyables_paths)
@@ -127,9 +136,9 @@ if __name__ == "__main__":
         logger.info(f"Current buyable solved count: {buyable_solved_count}")
         logger.info(f"Current emol solved count: {emol_solved_count}")
 
-        valid_results[target_key] = [eval(p) for p in raw_paths]
-        buyable_results[target_key] = [eval(p) for p in buyables_paths]
-        emol_results[target_key] = [eval(p) for p in emol_paths]
+        valid_results[target_key] = parsed_paths
+        buyable_results[target_key] = buyables_paths
+        emol_results[target_key] = emol_paths
 
     end = time.time()
 
@@ -140,8 +149,7 @@ if __name__ == "__main__":
         "time_elapsed": end - start,
     }
     logger.info(f"Results: {results}")
-    with open(save_dir / "results.json", "w") as f:
-        json.dump(results, f)
+    save_json(results, save_dir / "results.json")
     save_json_gz(valid_results, save_dir / "valid_results.json.gz")
     save_json_gz(buyable_results, save_dir / "buyable_results.json.gz")
     save_json_gz(emol_results, save_dir / "emol_results.json.gz")
@@ -6,10 +6,10 @@ from typing import Annotated, Any, Literal
 from pydantic import BaseModel, Field, RootModel, ValidationError
 
 from ursa.adapters.base_adapter import BaseAdapter
-from ursa.domain.chem import canonicalize_smiles
+from ursa.domain.chem import canonicalize_smiles_cached
 from ursa.domain.schemas import BenchmarkTree, MoleculeNode, ReactionNode, TargetInfo
 from ursa.exceptions import AdapterLogicError, UrsaException
-from ursa.typing import ReactionSmilesStr, SmilesStr
+from ursa.typing import ReactionSmilesStr
 from ursa.utils.hashing import generate_molecule_hash
 from ursa.utils.logging import logger
 
@@ -74,7 +74,7 @@ class AizynthAdapter(BaseAdapter):
         Orchestrates the transformation of a single AiZynthFinder output tree.
         Raises UrsaException on failure.
         """
-        retrosynthetic_tree = self._build_molecule_node(aizynth_mol=aizynth_root, path_prefix="ursa-mol-root")
+        retrosynthetic_tree = self._build_molecule_node(aizynth_mol=aizynth_root, node_path="root")
 
         if retrosynthetic_tree.smiles != target_info.smiles:
             msg = (
@@ -86,68 +86,73 @@ class AizynthAdapter(BaseAdapter):
 
         return BenchmarkTree(target=target_info, retrosynthetic_tree=retrosynthetic_tree)
 
-    def _build_molecule_node(self, aizynth_mol: AizynthMoleculeInput, path_prefix: str) -> MoleculeNode:
+    def _build_molecule_node(self, aizynth_mol: AizynthMoleculeInput, node_path: str) -> MoleculeNode:
         """
-        Recursively builds a canonical MoleculeNode from a raw aizynth 'mol' node.
-        """
-        if aizynth_mol.type != "mol":
-            raise AdapterLogicError(f"Expected node type 'mol' but got '{aizynth_mol.type}' at path {path_prefix}")
-
-        canon_smiles = canonicalize_smiles(aizynth_mol.smiles)
-        is_starting_mat = not bool(aizynth_mol.children)
-        reactions = []
-
-        if not is_starting_mat:
-            if len(aizynth_mol.children) > 1:
-                logger.warning(
-                    f"Molecule {canon_smiles} has multiple child reactions; only the first is used in a tree."
-                )
+        Builds a canonical MoleculeNode tree from a raw aizynth 'mol' node.
 
-            # a molecule node's child must be a reaction node
-            reaction_input = aizynth_mol.children[0]
-            if not isinstance(reaction_input, AizynthReactionInput):
-                raise AdapterLogicError(f"Child of molecule node was not a reaction node at {path_prefix}")
+        The tree is walked with an explicit stack in post-order: a molecule is pushed
+        once to schedule its reactants and again to be assembled after all of them are
+        built. Deep routes therefore never hit the recursion limit.
 
-            reaction_node = self._build_reaction_node(
-                aizynth_rxn=reaction_input,
-                product_smiles=canon_smiles,
-                path_prefix=path_prefix,  # reaction takes the parent molecule's path
-            )
-            reactions.append(reaction_node)
-
-        return MoleculeNode(
-            id=path_prefix,
-            molecule_hash=generate_molecule_hash(canon_smiles),
-            smiles=canon_smiles,
-            is_starting_material=is_starting_mat,
-            reactions=reactions,
-        )
-
-    def _build_reaction_node(
-        self, aizynth_rxn: AizynthReactionInput, product_smiles: SmilesStr, path_prefix: str
-    ) -> ReactionNode:
-        """
-        Builds a canonical ReactionNode from a raw aizynth 'reaction' node.
-        This is called by _build_molecule_node.
+        `node_path` is the position of the molecule in the tree ('root', 'root-0', ...);
+        a molecule gets the id 'ursa-mol-<node_path>' and the reaction forming it
+        'ursa-rxn-<node_path>'.
         """
-        if aizynth_rxn.type != "reaction":
-            raise AdapterLogicError(f"Expected node type 'reaction' but got '{aizynth_rxn.type}'")
-
-        reactants: list[MoleculeNode] = []
-        reactant_smiles_list: list[SmilesStr] = []
-
-        for i, reactant_mol_input in enumerate(aizynth_rxn.children):
-            if not isinstance(reactant_mol_input, AizynthMoleculeInput):
-                raise AdapterLogicError(f"Child of reaction node was not a molecule node at {path_prefix}")
+        built: dict[str, MoleculeNode] = {}
+        # (raw molecule, node path, whether its reactants have already been scheduled)
+        stack: list[tuple[AizynthMoleculeInput, str, bool]] = [(aizynth_mol, node_path, False)]
+
+        while stack:
+            mol_input, path, expanded = stack.pop()
+
+            if not expanded:
+                if mol_input.type != "mol":
+                    raise AdapterLogicError(
+                        f"Expected node type 'mol' but got '{mol_input.type}' at path ursa-mol-{path}"
+                    )
+                stack.append((mol_input, path, True))
+                if mol_input.children:
+                    # a molecule node's child must be a reaction node
+                    reaction_input = mol_input.children[0]
+                    if not isinstance(reaction_input, AizynthReactionInput):
+                        raise AdapterLogicError(f"Child of molecule node was not a reaction node at ursa-mol-{path}")
+                    if reaction_input.type != "reaction":
+                        raise AdapterLogicError(f"Expected node type 'reaction' but got '{reaction_input.type}'")
+                    for i, reactant_mol_input in enumerate(reaction_input.children):
+                        if not isinstance(reactant_mol_input, AizynthMoleculeInput):
+                            raise AdapterLogicError(
+                                f"Child of reaction node was not a molecule node at ursa-mol-{path}"
+                            )
+                        stack.append((reactant_mol_input, f"{path}-{i}", False))
+                continue
 
-            reactant_node = self._build_molecule_node(aizynth_mol=reactant_mol_input, path_prefix=f"{path_prefix}-{i}")
-            reactants.append(reactant_node)
-            reactant_smiles_list.append(reactant_node.smiles)
+            canon_smiles = canonicalize_smiles_cached(mol_input.smiles)
+            is_starting_mat = not bool(mol_input.children)
+            reactions = []
+
+            if not is_starting_mat:
+                if len(mol_input.children) > 1:
+                    logger.warning(
+                        f"Molecule {canon_smiles} has multiple child reactions; only the first is used in a tree."
+                    )
+                # reactants were assembled before this molecule was popped the second time
+                num_reactants = len(mol_input.children[0].children)
+                reactants = [built.pop(f"{path}-{i}") for i in range(num_reactants)]
+                reaction_smiles = ReactionSmilesStr(f"{'.'.join(sorted(r.smiles for r in reactants))}>>{canon_smiles}")
+                reactions.append(
+                    ReactionNode(
+                        id=f"ursa-rxn-{path}",  # reaction takes the parent molecule's path
+                        reaction_smiles=reaction_smiles,
+                        reactants=reactants,
+                    )
+                )
 
-        reaction_smiles = ReactionSmilesStr(f"{'.'.join(sorted(reactant_smiles_list))}>>{product_smiles}")
+            built[path] = MoleculeNode(
+                id=f"ursa-mol-{path}",
+                molecule_hash=generate_molecule_hash(canon_smiles),
+                smiles=canon_smiles,
+                is_starting_material=is_starting_mat,
+                reactions=reactions,
+            )
 
-        return ReactionNode(
-            id=path_prefix.replace("ursa-mol", "ursa-rxn"),
-            reaction_smiles=reaction_smiles,
-            reactants=reactants,
-        )
+        return built[node_path]
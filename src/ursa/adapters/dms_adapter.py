@@ -4,10 +4,10 @@ from typing import Any
 from pydantic import BaseModel, Field, RootModel, ValidationError
 
 from ursa.adapters.base_adapter import BaseAdapter
-from ursa.domain.chem import canonicalize_smiles
+from ursa.domain.chem import canonicalize_smiles_cached
 from ursa.domain.schemas import BenchmarkTree, MoleculeNode, ReactionNode, TargetInfo
 from ursa.exceptions import AdapterLogicError, UrsaException
-from ursa.typing import ReactionSmilesStr, SmilesStr
+from ursa.typing import ReactionSmilesStr
 from ursa.utils.hashing import generate_molecule_hash
 from ursa.utils.logging import logger
 
@@ -62,8 +62,8 @@ class DMSAdapter(BaseAdapter):
         Orchestrates the transformation of a single DMS output tree.
         Raises UrsaException on failure.
         """
-        # begin the recursion from the root node
-        retrosynthetic_tree = self._build_molecule_node(dms_node=raw_data, path_prefix="ursa-mol-root")
+        # build the whole tree from the root node
+        retrosynthetic_tree = self._build_molecule_node(dms_node=raw_data, node_path="root")
 
         # Final validation: does the transformed tree root match the canonical target smiles?
         if retrosynthetic_tree.smiles != target_info.smiles:
@@ -77,35 +77,44 @@ class DMSAdapter(BaseAdapter):
 
         return BenchmarkTree(target=target_info, retrosynthetic_tree=retrosynthetic_tree)
 
-    def _build_molecule_node(self, dms_node: DMSTree, path_prefix: str) -> MoleculeNode:
+    def _build_molecule_node(self, dms_node: DMSTree, node_path: str) -> MoleculeNode:
         """
-        Recursively builds a MoleculeNode. This will propagate InvalidSmilesError if it occurs.
+        Builds a MoleculeNode tree. This will propagate InvalidSmilesError if it occurs.
+
+        The tree is walked with an explicit stack in post-order: a node is pushed
+        once to schedule its children and again to be assembled after all of them
+        are built. Deep routes therefore never hit the recursion limit.
         """
-        canon_smiles = canonicalize_smiles(dms_node.smiles)
-        is_starting_mat = not bool(dms_node.children)
-        reactions = []
+        built: dict[str, MoleculeNode] = {}
+        # (raw node, node path, whether its children have already been scheduled)
+        stack: list[tuple[DMSTree, str, bool]] = [(dms_node, node_path, False)]
 
-        if not is_starting_mat:
-            reactants: list[MoleculeNode] = []
-            reactant_smiles_list: list[SmilesStr] = []
+        while stack:
+            node, path, expanded = stack.pop()
 
-            for i, child_node in enumerate(dms_node.children):
-                reactant_node = self._build_molecule_node(dms_node=child_node, path_prefix=f"{path_prefix}-{i}")
-                reactants.append(reactant_node)
-                reactant_smiles_list.append(reactant_node.smiles)
+            if not expanded:
+                stack.append((node, path, True))
+                stack.extend((child, f"{path}-{i}", False) for i, child in enumerate(node.children))
+                continue
 
-            reaction_smiles = ReactionSmilesStr(f"{'.'.join(sorted(reactant_smiles_list))}>>{canon_smiles}")
+            canon_smiles = canonicalize_smiles_cached(node.smiles)
+            is_starting_mat = not bool(node.children)
+            reactions = []
 
-            reactions.append(
-                ReactionNode(
-                    id=path_prefix.replace("ursa-mol", "ursa-rxn"), reaction_smiles=reaction_smiles, reactants=reactants
+            if not is_starting_mat:
+                # children were assembled before this node was popped the second time
+                reactants = [built.pop(f"{path}-{i}") for i in range(len(node.children))]
+                reaction_smiles = ReactionSmilesStr(f"{'.'.join(sorted(r.smiles for r in reactants))}>>{canon_smiles}")
+                reactions.append(
+                    ReactionNode(id=f"ursa-rxn-{path}", reaction_smiles=reaction_smiles, reactants=reactants)
                 )
+
+            built[path] = MoleculeNode(
+                id=f"ursa-mol-{path}",
+                molecule_hash=generate_molecule_hash(canon_smiles),
+                smiles=canon_smiles,
+                is_starting_material=is_starting_mat,
+                reactions=reactions,
             )
 
-        return MoleculeNode(
-            id=path_prefix,
-            molecule_hash=generate_molecule_hash(canon_smiles),
-            smiles=canon_smiles,
-            is_starting_material=is_starting_mat,
-            reactions=reactions,
-        )
+        return built[node_path]
@@ -0,0 +1,181 @@
+"""
+Command-line entry point for ursa.
+
+Subcommands:
+    ursa process aizynth|dms  transform raw model outputs into the benchmark format.
+    ursa verify               re-compute a run hash from a manifest and its raw files.
+
+`main` accepts an explicit argv, so a sweep harness can call it repeatedly from
+one interpreter instead of paying python/rdkit startup for every run. Heavy
+imports (rdkit via the adapters and core) are deferred to the subcommand that
+needs them, so `ursa verify` never loads rdkit.
+"""
+
+import argparse
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ursa.utils.logging import logger
+
+if TYPE_CHECKING:
+    from ursa.adapters.base_adapter import BaseAdapter
+
+# ANSI color codes for pretty printing
+GREEN = "\033[92m"
+RED = "\033[91m"
+RESET = "\033[0m"
+
+
+def _make_adapter(name: str) -> "BaseAdapter":
+    if name == "aizynth":
+        from ursa.adapters.aizynth_adapter import AizynthAdapter
+
+        return AizynthAdapter()
+    if name == "dms":
+        from ursa.adapters.dms_adapter import DMSAdapter
+
+        return DMSAdapter()
+    raise ValueError(f"Unknown adapter: {name}")
+
+
+def _process(args: argparse.Namespace) -> int:
+    from ursa.core import process_model_run
+    from ursa.exceptions import UrsaException
+    from ursa.io import load_and_prepare_targets
+    from ursa.utils.smiles_cache import SmilesCache
+
+    if args.base_dir is not None:
+        # absolute paths survive the join unchanged
+        args.raw_file = args.base_dir / args.raw_file
+        args.output_dir = args.base_dir / args.output_dir
+        args.targets_file = args.base_dir / args.targets_file
+        if args.smiles_cache is not None:
+            args.smiles_cache = args.base_dir / args.smiles_cache
+
+    smiles_cache: SmilesCache | None = None
+    try:
+        if args.smiles_cache is not None:
+            smiles_cache = SmilesCache(args.smiles_cache)
+        targets_map = load_and_prepare_targets(args.targets_file, smiles_cache, max_workers=args.workers)
+        process_model_run(
+            model_name=args.model_name,
+            adapter=_make_adapter(args.adapter),
+            raw_results_file=args.raw_file,
+            processed_dir=args.output_dir,
+            targets_map=targets_map,
+            force=args.force,
+            max_workers=args.workers,
+        )
+        logger.info("🎉 Script finished successfully. 🎉")
+        return 0
+    except UrsaException as e:
+        logger.error(f"A critical error occurred during processing: {e}")
+        logger.error("Script aborted.")
+        return 1
+    except Exception as e:
+        logger.critical(f"An unexpected, non-Ursa error occurred: {e}", exc_info=True)
+        logger.critical("Script aborted due to a fatal error.")
+        return 1
+    finally:
+        if smiles_cache is not None:
+            smiles_cache.close()
+
+
+def _verify(args: argparse.Namespace) -> int:
+    from pydantic_core import from_json
+
+    from ursa.exceptions import UrsaException
+    from ursa.utils.hashing import generate_run_hash, get_file_hashes
+
+    try:
+        logger.info(f"Loading manifest from: {args.manifest}")
+        manifest_data = from_json(args.manifest.read_bytes())
+
+        # This is the hash we are trying to match.
+        original_hash_from_manifest = manifest_data["run_hash"]
+        model_name = manifest_data["model_name"]
+        source_files = manifest_data["source_files"]  # This is a dict of filename -> hash
+
+        logger.info(f"Verifying run for model '{model_name}'...")
+        logger.info(f"Original run hash from manifest: {original_hash_from_manifest}")
+
+        filenames = sorted(source_files.keys())  # Sort for deterministic order
+        file_paths = [args.raw_dir / filename for filename in filenames]
+        for filename, file_path in zip(filenames, file_paths, strict=True):
+            if not file_path.is_file():
+                logger.error(f"{RED}FAILURE: Source file '{filename}' not found at expected path: {file_path}{RESET}")
+                return 1
+
+        # always re-read the files: the in-process cache cannot see same-size edits that restore the mtime
+        recalculated_file_hashes = get_file_hashes(file_paths, use_cache=False)
+        for filename, file_hash in zip(filenames, recalculated_file_hashes, strict=True):
+            logger.info(f"  - Calculated hash for '{filename}': {file_hash[:12]}...")
+
+        recalculated_run_hash = generate_run_hash(model_name, recalculated_file_hashes)
+        logger.info(f"Recalculated run hash from source files: {recalculated_run_hash}")
+
+        if recalculated_run_hash == original_hash_from_manifest:
+            logger.info(f"{GREEN}---> SUCCESS: Verification passed. The hashes match! <---{RESET}")
+            return 0
+        logger.error(f"{RED}---> FAILURE: Verification FAILED. The hashes DO NOT match. <---{RESET}")
+        logger.error("This means the raw input files have changed or the model name is different.")
+        return 1
+
+    except FileNotFoundError:
+        logger.error(f"{RED}FAILURE: Manifest file not found at: {args.manifest}{RESET}")
+        return 1
+    except (ValueError, KeyError) as e:
+        logger.error(f"{RED}FAILURE: Manifest file is corrupted or malformed. Error: {e}{RESET}")
+        return 1
+    except UrsaException as e:
+        logger.error(f"{RED}FAILURE: An I/O error occurred while reading a source file: {e}{RESET}")
+        return 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Builds the top-level `ursa` argument parser with all subcommands."""
+    # fmt:off
+    parser = argparse.ArgumentParser(prog="ursa", description="Ursa benchmark tooling.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    process = subparsers.add_parser("process", help="Transform raw model outputs for the Ursa benchmark.")
+    process.add_argument("adapter", choices=["aizynth", "dms"],
+           help="Which model adapter to use for the raw outputs.")
+    process.add_argument("--model-name", type=str, required=True,
+           help="A unique name for this model run (e.g., 'dms_v1_run1'). Used for anonymization.")
+    process.add_argument("--raw-file", type=Path, required=True,
+           help="Path to the raw *.json.gz output file from the model.")
+    process.add_argument("--output-dir", type=Path, required=True,
+           help="Directory where the processed, anonymized data will be saved.")
+    process.add_argument("--targets-file", type=Path, required=True,
+           help="Path to a file mapping target IDs to their SMILES strings.")
+    process.add_argument("--smiles-cache", type=Path, default=None,
+           help="Optional sqlite file caching canonical SMILES across runs (e.g. 'data/cache/smiles.sqlite').")
+    process.add_argument("--force", action="store_true",
+           help="Reprocess even if a manifest for this run hash already exists.")
+    process.add_argument("--workers", type=int, default=1,
+           help="Processes used to canonicalize target SMILES and to adapt targets. Worth raising for large runs.")
+    process.add_argument("--base-dir", type=Path, default=None,
+           help="Resolve relative file and directory arguments against this directory instead of the CWD.")
+    process.set_defaults(func=_process)
+
+    verify = subparsers.add_parser("verify", help="Verify the integrity of a processed Ursa benchmark run.")
+    verify.add_argument("--manifest", type=Path, required=True,
+           help="Path to the manifest.json file for the run to be verified.")
+    verify.add_argument("--raw-dir", type=Path, required=True,
+           help="Path to the ORIGINAL raw data directory containing the source files.")
+    verify.set_defaults(func=_verify)
+    # fmt:on
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Parses `argv` (defaults to sys.argv) and runs the chosen subcommand. Returns an exit code."""
+    args = build_parser().parse_args(argv)
+    exit_code: int = args.func(args)
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
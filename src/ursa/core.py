@@ -1,4 +1,7 @@
 import datetime
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from typing import Any
 
@@ -8,20 +11,66 @@ from ursa.adapters.base_adapter import BaseAdapter
 from ursa.domain.schemas import RunStatistics, TargetInfo
 from ursa.domain.tree import deduplicate_routes
 from ursa.exceptions import UrsaIOException
-from ursa.io import load_json_gz, save_json, save_json_gz
+from ursa.io import JsonGzWriter, load_json, load_json_gz, save_json
 from ursa.utils.hashing import generate_run_hash, get_file_hash
 from ursa.utils.logging import logger
 
 
+def _is_processed(manifest_path: Path, run_hash: str) -> bool:
+    """Checks whether a readable manifest for `run_hash` exists at `manifest_path`, along with the results it lists."""
+    if not manifest_path.is_file():
+        return False
+    try:
+        manifest = load_json(manifest_path)
+    except UrsaIOException:
+        logger.warning(f"Existing manifest {manifest_path} is unreadable; reprocessing.")
+        return False
+    if manifest.get("run_hash") != run_hash:
+        return False
+    results_file = manifest.get("results_file")
+    if results_file is not None and not (manifest_path.parent / results_file).is_file():
+        logger.warning(f"Results file {results_file} listed in {manifest_path} is missing; reprocessing.")
+        return False
+    return True
+
+
+def _process_target(adapter: BaseAdapter, raw_routes_list: Any, target_info: TargetInfo) -> tuple[list[str], int]:
+    """
+    Adapts and deduplicates the routes of a single target.
+
+    Module-level so it can run in a worker process. Returns the unique trees,
+    already serialized to JSON, and the number of routes before deduplication.
+    """
+    # This is now fully generic. The adapter handles all the specifics.
+    transformed_trees = list(adapter.adapt(raw_routes_list, target_info))
+
+    # Deduplicate the successful routes for this target
+    unique_trees = deduplicate_routes(transformed_trees)
+
+    # Serialize immediately to avoid holding complex Pydantic objects in memory. pydantic's rust
+    # serializer goes straight to JSON, several times faster than model_dump() followed by json.dumps.
+    return [tree.model_dump_json() for tree in unique_trees], len(transformed_trees)
+
+
 def process_model_run(
     model_name: str,
     adapter: BaseAdapter,
     raw_results_file: Path,
     processed_dir: Path,
     targets_map: dict[str, TargetInfo],
+    force: bool = False,
+    max_workers: int = 1,
 ) -> None:
     """
     Orchestrates the processing pipeline for a model's output, now fully decoupled.
+
+    The run hash covers the model name and the raw file content, so if a manifest
+    for the same hash already exists in `processed_dir` the run is skipped.
+    Pass `force=True` to reprocess anyway (e.g. after changing an adapter).
+
+    Targets are independent, so with `max_workers > 1` they are adapted in a
+    process pool. The adapter is pickled to the workers and results are
+    collected in input order, so the output is identical to a serial run.
     """
     logger.info(f"--- Starting Ursa Processing for Model: '{model_name}' ---")
     processed_dir.mkdir(parents=True, exist_ok=True)
@@ -31,48 +80,68 @@ def process_model_run(
     #     logger.warning(f"No '.json.gz' files found in {raw_results_dir}. Aborting.")
     #     return
 
-    run_hash = generate_run_hash(model_name, [get_file_hash(raw_results_file)])
+    raw_file_hash = get_file_hash(raw_results_file)
+    run_hash = generate_run_hash(model_name, [raw_file_hash])
     logger.info(f"Generated unique run hash: '{run_hash}'")
 
-    final_output_data: dict[str, list[dict[str, Any]]] = {}  # Store as dicts for direct JSON serialization
+    manifest_path = processed_dir / f"{run_hash}-manifest.json"
+    if not force and _is_processed(manifest_path, run_hash):
+        logger.info(f"Run already processed, manifest exists at {manifest_path}. Skipping.")
+        return
+
     stats = RunStatistics()
     source_file_info = {}
 
-    for file_path in [raw_results_file]:
-        try:
-            logger.info(f"Processing file: {file_path.name}")
-            raw_data_per_target = load_json_gz(file_path)
-            source_file_info[file_path.name] = get_file_hash(file_path)
-        except UrsaIOException as e:
-            logger.error(f"Could not read or parse file {file_path}. Skipping. Error: {e}")
-            continue
-
-        pbar = tqdm(raw_data_per_target.items(), desc="Processing targets", unit="target")
-        for target_id, raw_routes_list in pbar:
-            if target_id not in targets_map:
-                logger.warning(f"Skipping routes for '{target_id}': No target info found.")
+    output_path = processed_dir / f"{run_hash}-results.json.gz"
+    with JsonGzWriter(output_path) as results_writer:
+        for file_path in [raw_results_file]:
+            try:
+                logger.info(f"Processing file: {file_path.name}")
+                raw_data_per_target = load_json_gz(file_path)
+                source_file_info[file_path.name] = raw_file_hash
+            except UrsaIOException as e:
+                logger.error(f"Could not read or parse file {file_path}. Skipping. Error: {e}")
                 continue
 
-            # This is now fully generic. The adapter handles all the specifics.
-            transformed_trees = list(adapter.adapt(raw_routes_list, targets_map[target_id]))
+            known_targets: list[str] = []
+            raw_routes: list[Any] = []
+            target_infos: list[TargetInfo] = []
+            for target_id, raw_routes_list in raw_data_per_target.items():
+                target_info = targets_map.get(target_id)
+                if target_info is None:
+                    logger.warning(f"Skipping routes for '{target_id}': No target info found.")
+                    continue
+                known_targets.append(target_id)
+                raw_routes.append(raw_routes_list)
+                target_infos.append(target_info)
 
-            # Deduplicate the successful routes for this target
-            unique_trees = deduplicate_routes(transformed_trees)
+            executor = ProcessPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+            try:
+                results: Iterator[tuple[list[str], int]]
+                if executor is None:
+                    results = map(_process_target, repeat(adapter), raw_routes, target_infos)
+                else:
+                    chunksize = max(1, len(known_targets) // (max_workers * 4))
+                    results = executor.map(
+                        _process_target, repeat(adapter), raw_routes, target_infos, chunksize=chunksize
+                    )
 
-            if len(unique_trees):
-                # Dump to dict immediately to avoid holding complex Pydantic objects in memory
-                final_output_data[target_id] = [tree.model_dump() for tree in unique_trees]
-                stats.targets_with_at_least_one_route.add(target_id)
+                pbar = tqdm(results, total=len(known_targets), desc="Processing targets", unit="target")
+                for target_id, (unique_trees, num_transformed) in zip(known_targets, pbar, strict=True):
+                    if unique_trees:
+                        results_writer.write_raw_entry(target_id, f"[{','.join(unique_trees)}]")
+                        stats.targets_with_at_least_one_route.add(target_id)
 
-            # Update statistics based on the process
-            stats.successful_routes_before_dedup += len(transformed_trees)
-            stats.final_unique_routes_saved += len(unique_trees)
+                    # Update statistics based on the process
+                    stats.successful_routes_before_dedup += num_transformed
+                    stats.final_unique_routes_saved += len(unique_trees)
+            finally:
+                if executor is not None:
+                    executor.shutdown()
 
-    if final_output_data:
-        output_filename = f"{run_hash}-results.json.gz"
-        output_path = processed_dir / output_filename
-        logger.info(f"Writing {stats.final_unique_routes_saved} unique routes to: {output_path}")
-        save_json_gz(final_output_data, output_path)
+    if results_writer.num_entries:
+        output_filename: str | None = output_path.name
+        logger.info(f"Wrote {stats.final_unique_routes_saved} unique routes to: {output_path}")
     else:
         logger.warning("No routes were successfully processed. No output file written.")
         output_filename = None
@@ -85,6 +154,5 @@ def process_model_run(
         "source_files": source_file_info,
         "statistics": stats.to_manifest_dict(),
     }
-    manifest_path = processed_dir / f"{run_hash}-manifest.json"
     save_json(manifest, manifest_path)
     logger.info(f"--- Processing Complete. Manifest written to {manifest_path} ---")
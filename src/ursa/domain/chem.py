@@ -1,10 +1,25 @@
-from rdkit import Chem, rdBase
+from functools import cache
+from types import ModuleType
 
 from ursa.exceptions import InvalidSmilesError, UrsaException
 from ursa.typing import InchiKeyStr, SmilesStr
 from ursa.utils.logging import logger
 
-rdBase.DisableLog("rdApp.error")
+
+@cache
+def _rdkit_chem() -> ModuleType:
+    """Imports `rdkit.Chem` on first use, so importing ursa (e.g. just to load results) does not pay for RDKit."""
+    from rdkit import Chem, rdBase
+
+    rdBase.DisableLog("rdApp.error")
+    return Chem
+
+
+def rdkit_version() -> str:
+    """The installed RDKit version. Canonical SMILES are only guaranteed stable within one version."""
+    from rdkit import __version__
+
+    return str(__version__)
 
 
 def canonicalize_smiles(smiles: str) -> SmilesStr:
@@ -26,6 +41,7 @@ def canonicalize_smiles(smiles: str) -> SmilesStr:
         raise InvalidSmilesError("SMILES input must be a non-empty string.")
 
     try:
+        Chem = _rdkit_chem()
         mol = Chem.MolFromSmiles(smiles)
         if mol is None:
             # this is rdkit's sad, C-style way of saying "parse failed"
@@ -47,6 +63,38 @@ def canonicalize_smiles(smiles: str) -> SmilesStr:
         raise UrsaException(f"An unexpected error occurred during SMILES processing: {e}") from e
 
 
+_CANON_CACHE_MAXSIZE = 1_000_000
+_canon_cache: dict[str, SmilesStr] = {}
+
+
+def canonicalize_smiles_cached(smiles: str) -> SmilesStr:
+    """
+    Same as `canonicalize_smiles`, but memoized per process.
+
+    Routes share most of their intermediates and starting materials, so the same
+    raw SMILES reaches RDKit many times during a run. The canonical form is cached
+    as its own key too, so already-canonical inputs hit immediately, and all raw
+    spellings of a molecule return the same string object. Invalid SMILES
+    are not cached and raise on every call. For a cache that persists across runs,
+    see `ursa.utils.smiles_cache.SmilesCache`.
+    """
+    try:
+        canon = _canon_cache.get(smiles)
+    except TypeError:
+        # unhashable junk; let the uncached function raise the usual error
+        return canonicalize_smiles(smiles)
+    if canon is None:
+        # misses go through canonicalize_smiles, whose guards reject non-str and empty input,
+        # so hits skip the type check entirely
+        canon = canonicalize_smiles(smiles)
+        if len(_canon_cache) >= _CANON_CACHE_MAXSIZE:
+            _canon_cache.clear()
+        # the canonical key doubles as an intern pool: every spelling of a molecule maps to one string object
+        canon = _canon_cache.setdefault(canon, canon)
+        _canon_cache[smiles] = canon
+    return canon
+
+
 def get_inchi_key(smiles: str) -> str:
     """
     Generates a standard InChIKey from a SMILES string.
@@ -66,6 +114,7 @@ def get_inchi_key(smiles: str) -> str:
         raise InvalidSmilesError("SMILES input must be a non-empty string.")
 
     try:
+        Chem = _rdkit_chem()
         mol = Chem.MolFromSmiles(smiles)
         if mol is None:
             logger.warning(f"RDKit failed to parse SMILES for InChIKey generation: '{smiles}'")
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field, model_validator
+import sys
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from ursa.exceptions import SchemaLogicError
 from ursa.typing import ReactionSmilesStr, SmilesStr
@@ -54,6 +56,8 @@ class ReactionNode(BaseModel):
     Represents a single retrosynthetic reaction step in the benchmark tree.
     """
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     id: str = Field(..., description="A unique, path-dependent identifier for the reaction.")
     reaction_smiles: ReactionSmilesStr
     reactants: list["MoleculeNode"] = Field(default_factory=list)
@@ -65,8 +69,13 @@ class MoleculeNode(BaseModel):
 
     This is the core recursive data structure for the retrosynthetic route.
     It contains the molecule's identity and the reaction(s) that form it.
+    Nodes are frozen; derive modified copies with `model_copy(update=...)`.
+    Freezing does not make them hashable (they hold lists), so key sets and
+    dicts by `molecule_hash` or a tree signature, not by the node itself.
     """
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     id: str = Field(..., description="A unique, path-dependent identifier for this molecule instance.")
     molecule_hash: str = Field(
         ..., description="A content-based hash of the canonical SMILES, identical for identical molecules."
@@ -75,6 +84,12 @@ class MoleculeNode(BaseModel):
     is_starting_material: bool
     reactions: list[ReactionNode] = Field(default_factory=list)
 
+    @field_validator("molecule_hash", "smiles")
+    @classmethod
+    def intern_identity(cls, value: str) -> str:
+        """Interns hash and SMILES so every node of the same molecule shares one string and compares by identity."""
+        return sys.intern(value)
+
     @model_validator(mode="after")
     def check_tree_logic(self) -> "MoleculeNode":
         """
@@ -102,6 +117,8 @@ class MoleculeNode(BaseModel):
 class TargetInfo(BaseModel):
     """A simple container for the target molecule's identity."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     smiles: SmilesStr
     id: str = Field(..., description="The original identifier for the target molecule.")
 
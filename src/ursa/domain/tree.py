@@ -3,44 +3,81 @@ import hashlib
 from ursa.domain.schemas import BenchmarkTree, MoleculeNode
 from ursa.utils.logging import logger
 
+# 128 bits keeps accidental collisions out of reach for any realistic route count, at half the key size
+_SIGNATURE_DIGEST_SIZE = 16
 
-def _generate_tree_signature(node: MoleculeNode) -> str:
-    """
-    Recursively generates a canonical, order-invariant signature for a
-    molecule node and its entire history.
+# keyed by (molecule_hash, *sorted reactant signatures)
+_SignatureMemo = dict[tuple[str | bytes, ...], bytes]
 
-    This version does not use memoization as tree objects should not be large
-    enough to make this a performance bottleneck, and it avoids subtle bugs.
 
-    Args:
-        node: The MoleculeNode to generate a signature for.
-
-    Returns:
-        A hash representing the canonical signature of the tree/subtree.
+def _generate_tree_signature(node: MoleculeNode, memo: _SignatureMemo | None = None) -> bytes:
     """
-    # Base Case: The node is a starting material. Its signature is its own hash.
-    if node.is_starting_material:
-        return node.molecule_hash
+    Generates a canonical, order-invariant signature for a molecule node and
+    its entire history.
 
-    # Recursive Step: The node is an intermediate.
-    # Its signature depends on the sorted signatures of its reactants.
-    if not node.reactions:  # Should not happen with validation, but good to be safe
-        return node.molecule_hash
+    The tree is walked post-order with an explicit stack, so there is no python
+    call per node and deep routes cannot hit the recursion limit.
 
-    reactant_signatures = []
-    # Assuming one reaction per node as per our schema
-    for reactant_node in node.reactions[0].reactants:
-        reactant_signatures.append(_generate_tree_signature(reactant_node))
+    Routes for the same target share most of their intermediates, so the same
+    subtree is signed over and over. If a `memo` is given, the hash for each
+    distinct (molecule_hash, sorted reactant signatures) pair is computed once.
+    The memo is keyed by content, never by the path-dependent node id, so it is
+    safe to share across all routes of a batch.
 
-    # Sort the signatures to ensure order-invariance (A.B>>C is same as B.A>>C)
-    sorted_signatures = sorted(reactant_signatures)
+    Signatures are raw bytes and only meant for comparison within a process:
+    a starting material is its encoded molecule hash, an intermediate is the
+    16-byte blake2b digest over its sorted reactant signatures and its own hash.
 
-    # The final signature string incorporates the history and the result.
-    signature_string = "".join(sorted_signatures) + ">>" + node.molecule_hash
-    signature_bytes = signature_string.encode("utf-8")
+    Args:
+        node: The MoleculeNode to generate a signature for.
+        memo: Optional cache shared across calls, filled in place.
 
-    # Hash the canonical representation to get the final signature
-    return f"tree_sha256:{hashlib.sha256(signature_bytes).hexdigest()}"
+    Returns:
+        The canonical signature of the tree/subtree.
+    """
+    # signatures of already visited nodes, keyed by object identity (all nodes stay alive during the walk)
+    signatures: dict[int, bytes] = {}
+    stack: list[tuple[MoleculeNode, bool]] = [(node, False)]
+
+    while stack:
+        current, expanded = stack.pop()
+
+        # A starting material's signature is its own hash.
+        # A non-starting node without reactions should not happen with validation, but good to be safe.
+        if current.is_starting_material or not current.reactions:
+            signatures[id(current)] = current.molecule_hash.encode()
+            continue
+
+        # Assuming one reaction per node as per our schema
+        reactants = current.reactions[0].reactants
+        if not expanded:
+            stack.append((current, True))
+            stack.extend((reactant, False) for reactant in reactants)
+            continue
+
+        # Sort the signatures to ensure order-invariance (A.B>>C is same as B.A>>C)
+        sorted_signatures = sorted(signatures[id(reactant)] for reactant in reactants)
+
+        key: tuple[str | bytes, ...] = (current.molecule_hash, *sorted_signatures)
+        if memo is not None and (cached := memo.get(key)) is not None:
+            signatures[id(current)] = cached
+            continue
+
+        # Feed the history and the result straight into the hasher, no intermediate string.
+        # blake2b is roughly twice as fast as sha256 on inputs this small, and nothing persists these digests
+        hasher = hashlib.blake2b(digest_size=_SIGNATURE_DIGEST_SIZE)
+        for signature in sorted_signatures:
+            hasher.update(signature)
+            hasher.update(b".")
+        hasher.update(b">>")
+        hasher.update(current.molecule_hash.encode())
+
+        digest = hasher.digest()
+        if memo is not None:
+            memo[key] = digest
+        signatures[id(current)] = digest
+
+    return signatures[id(node)]
 
 
 def deduplicate_routes(routes: list[BenchmarkTree]) -> list[BenchmarkTree]:
@@ -49,11 +86,13 @@ def deduplicate_routes(routes: list[BenchmarkTree]) -> list[BenchmarkTree]:
     """
     seen_signatures = set()
     unique_routes = []
+    # shared subtrees are signed once for the whole batch
+    memo: _SignatureMemo = {}
 
     logger.debug(f"Deduplicating {len(routes)} routes...")
 
     for route in routes:
-        signature = _generate_tree_signature(route.retrosynthetic_tree)
+        signature = _generate_tree_signature(route.retrosynthetic_tree, memo)
 
         if signature not in seen_signatures:
             seen_signatures.add(signature)
@@ -1,20 +1,30 @@
 import csv
 import gzip
 import json
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from types import TracebackType
 from typing import Any, TypeVar
 
 from pydantic import BaseModel
+from pydantic_core import from_json
 
-from ursa.domain.chem import canonicalize_smiles
+from ursa.domain.chem import canonicalize_smiles_cached
 from ursa.domain.schemas import TargetInfo
-from ursa.exceptions import UrsaException, UrsaIOException, UrsaSerializationError
+from ursa.exceptions import InvalidSmilesError, UrsaException, UrsaIOException, UrsaSerializationError
+from ursa.typing import SmilesStr
 from ursa.utils.logging import logger
+from ursa.utils.smiles_cache import SmilesCache
 
 # This allows us to return the same type that was passed in.
 # e.g., load_model(MyModel) -> MyModel
 T = TypeVar("T", bound=BaseModel)
 
+# gzip defaults to 9, which is ~2.5x slower than 6 on our results for files only ~1% smaller
+GZIP_COMPRESSLEVEL = 6
+
 
 def save_json_gz(data: dict[str, Any], path: Path) -> None:
     """
@@ -26,9 +36,10 @@ def save_json_gz(data: dict[str, Any], path: Path) -> None:
     try:
         path.parent.mkdir(parents=True, exist_ok=True)
         # We assume the data is a clean dict, no need for custom encoders.
-        json_str = json.dumps(data, indent=2)
-        with gzip.open(path, "wt", encoding="utf-8") as f:
-            f.write(json_str)
+        # no indent: indenting forces json onto its pure-python encoder, and nobody reads these files raw anyway.
+        json_bytes = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        with gzip.open(path, "wb", compresslevel=GZIP_COMPRESSLEVEL) as f:
+            f.write(json_bytes)
     except TypeError as e:
         logger.error(f"Data for {path} is not JSON serializable: {e}")
         raise UrsaSerializationError(f"Data serialization error for {path}: {e}") from e
@@ -45,16 +56,139 @@ def load_json_gz(path: Path) -> dict[str, Any]:
     the file contains valid JSON.
     """
     try:
-        with gzip.open(path, "rt", encoding="utf-8") as f:
-            loaded_data = json.load(f)
-            if not isinstance(loaded_data, dict):
-                raise UrsaIOException(f"Expected a JSON object (dict), but found {type(loaded_data)} in {path}")
-            return loaded_data
-    except (OSError, gzip.BadGzipFile, json.JSONDecodeError) as e:
+        # inflating the whole buffer in one call is much faster than pulling text through gzip.open
+        loaded_data = from_json(gzip.decompress(path.read_bytes()))
+        if not isinstance(loaded_data, dict):
+            raise UrsaIOException(f"Expected a JSON object (dict), but found {type(loaded_data)} in {path}")
+        return loaded_data
+    except (OSError, EOFError, gzip.BadGzipFile, ValueError) as e:
         logger.error(f"Failed to load or parse gzipped JSON file: {path}")
         raise UrsaIOException(f"Data loading error on {path}: {e}") from e
 
 
+def load_json_gz_many(paths: list[Path], max_workers: int | None = None) -> list[dict[str, Any]]:
+    """
+    Loads several gzipped JSON files concurrently, returning them in the order given.
+
+    zlib releases the GIL while inflating, so threads overlap the reads and the
+    decompression of independent files. Errors are raised as in `load_json_gz`.
+    """
+    if len(paths) <= 1:
+        return [load_json_gz(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(load_json_gz, paths))
+
+
+class JsonGzWriter:
+    """
+    Streams a JSON object into a gzipped file one `key: value` entry at a time.
+
+    Each value is serialized as soon as it is written, so peak memory is bounded
+    by a few values instead of the whole object. Compression and disk writes run
+    on a background thread (zlib releases the GIL), so the caller can compute the
+    next entry meanwhile; at most `max_pending` entries queue up before a write
+    waits. Write errors surface on a later write or on `close`.
+
+    The file is only created by the first entry, and it loads back with
+    `load_json_gz` like anything written by `save_json_gz`. If the `with` block
+    exits with an error, the partial file is removed.
+
+    Usage:
+        with JsonGzWriter(path) as writer:
+            writer.write_entry("target_1", [...])
+    """
+
+    def __init__(self, path: Path, max_pending: int = 8) -> None:
+        self.path = path
+        self.max_pending = max_pending
+        self.num_entries = 0
+        self._file: gzip.GzipFile | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: deque[Future[int]] = deque()
+
+    def write_entry(self, key: str, value: Any) -> None:
+        """Serializes `value` and appends it to the object under `key`."""
+        try:
+            raw_json = json.dumps(value, separators=(",", ":"))
+        except TypeError as e:
+            logger.error(f"Data for {self.path} is not JSON serializable: {e}")
+            raise UrsaSerializationError(f"Data serialization error for {self.path}: {e}") from e
+        self.write_raw_entry(key, raw_json)
+
+    def write_raw_entry(self, key: str, raw_json: str) -> None:
+        """
+        Appends an already serialized JSON value under `key`, e.g. the output of
+        a pydantic `model_dump_json()`. The value is written as is, unchecked.
+        """
+        entry = f"{json.dumps(key)}:{raw_json}"
+        if self._file is None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = gzip.GzipFile(self.path, "wb", compresslevel=GZIP_COMPRESSLEVEL)
+            except OSError as e:
+                logger.error(f"Failed to write gzipped JSON to {self.path}: {e}")
+                raise UrsaIOException(f"Data saving error on {self.path}: {e}") from e
+            # a single worker keeps the entries in submission order
+            self._executor = ThreadPoolExecutor(max_workers=1)
+            entry = "{" + entry
+        else:
+            entry = "," + entry
+        self._submit(entry.encode())
+        self.num_entries += 1
+
+    def _submit(self, data: bytes) -> None:
+        if self._file is None or self._executor is None:
+            raise UrsaIOException(f"JSON writer for {self.path} is not open")
+        # one write per entry: each GzipFile.write is a separate trip through zlib
+        self._pending.append(self._executor.submit(self._file.write, data))
+        self._wait(self.max_pending)
+
+    def _wait(self, max_pending: int) -> None:
+        """Blocks until at most `max_pending` writes are still queued, re-raising any write error."""
+        try:
+            while len(self._pending) > max_pending:
+                self._pending.popleft().result()
+        except OSError as e:
+            logger.error(f"Failed to write gzipped JSON to {self.path}: {e}")
+            raise UrsaIOException(f"Data saving error on {self.path}: {e}") from e
+
+    def _shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._pending.clear()
+
+    def close(self) -> None:
+        """Closes the JSON object and the file. Does nothing if no entry was written."""
+        if self._file is None:
+            return
+        try:
+            self._submit(b"}")
+            self._wait(0)
+            self._file.close()
+        except OSError as e:
+            logger.error(f"Failed to write gzipped JSON to {self.path}: {e}")
+            raise UrsaIOException(f"Data saving error on {self.path}: {e}") from e
+        finally:
+            self._shutdown()
+            self._file = None
+
+    def __enter__(self) -> "JsonGzWriter":
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None
+    ) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        if self._file is not None:
+            self._shutdown()
+            self._file.close()
+            self._file = None
+            self.path.unlink(missing_ok=True)
+
+
 def save_json(data: dict[str, Any], path: Path) -> None:
     """Saves a Python dictionary to a standard, uncompressed JSON file."""
     try:
@@ -66,6 +200,26 @@ def save_json(data: dict[str, Any], path: Path) -> None:
         raise UrsaIOException(f"Data saving error on {path}: {e}") from e
 
 
+def load_json(path: Path) -> dict[str, Any]:
+    """Loads a standard, uncompressed JSON file (e.g. a manifest) into a Python dictionary."""
+    try:
+        loaded_data = from_json(path.read_bytes())
+        if not isinstance(loaded_data, dict):
+            raise UrsaIOException(f"Expected a JSON object (dict), but found {type(loaded_data)} in {path}")
+        return loaded_data
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to load or parse JSON file: {path}")
+        raise UrsaIOException(f"Data loading error on {path}: {e}") from e
+
+
+def _csv_column_index(header: list[str], column: str, path: Path) -> int:
+    try:
+        return header.index(column)
+    except ValueError as e:
+        logger.error(f"Missing required column in CSV file {path}: '{column}'")
+        raise UrsaIOException(f"CSV column '{column}' not found in {path}") from e
+
+
 def load_targets_csv(path: Path) -> dict[str, str]:
     """
     Loads a CSV file containing target IDs and SMILES.
@@ -74,18 +228,22 @@ def load_targets_csv(path: Path) -> dict[str, str]:
     Returns a dictionary mapping target IDs to SMILES strings.
     """
     try:
-        with path.open("r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            if not reader.fieldnames:
+        with path.open("r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
                 logger.warning(f"CSV file {path} is empty or has no header")
                 return {}
-            data = {row["Structure ID"]: row["SMILES"] for row in reader}
+            # plain rows with the column positions resolved once; DictReader builds a dict per row
+            id_idx = _csv_column_index(header, "Structure ID", path)
+            smiles_idx = _csv_column_index(header, "SMILES", path)
+            data = {row[id_idx]: row[smiles_idx] for row in reader if row}
             if not data:
                 logger.warning(f"CSV file {path} is empty")
             return data
-    except KeyError as e:
-        logger.error(f"Missing required column in CSV file {path}: {e}")
-        raise UrsaIOException(f"CSV column {e} not found in {path}") from e
+    except IndexError as e:
+        logger.error(f"CSV file {path} has a row with missing columns")
+        raise UrsaIOException(f"CSV parsing error on {path}: row with missing columns") from e
     except OSError as e:
         logger.error(f"Failed to read CSV file: {path}")
         raise UrsaIOException(f"Data loading error on {path}: {e}") from e
@@ -102,51 +260,108 @@ def load_targets_json(path: Path) -> dict[str, str]:
     Returns a dictionary mapping target IDs to SMILES strings.
     """
     try:
-        if path.suffix == ".gz":
-            with gzip.open(path, "rt") as f:
-                data = json.load(f)
-        else:
-            with path.open("r") as f:
-                data = json.load(f)
+        raw = path.read_bytes()
+        data = from_json(gzip.decompress(raw) if path.suffix == ".gz" else raw)
 
         if not isinstance(data, dict):
             raise UrsaIOException(f"Expected JSON object (dict), found {type(data)}")
         if not data:
             logger.warning(f"JSON file {path} is empty")
         return data
-    except (OSError, json.JSONDecodeError) as e:
+    except (OSError, EOFError, ValueError) as e:
         logger.error(f"Failed to read or parse JSON file: {path}")
         raise UrsaIOException(f"Data loading error on {path}: {e}") from e
 
 
-def load_and_prepare_targets(file_path: Path) -> dict[str, TargetInfo]:
+# target file suffix -> loader; gzipped files are keyed by their full ".json.gz" suffix
+_TARGET_LOADERS: dict[str, Callable[[Path], dict[str, str]]] = {
+    ".csv": load_targets_csv,
+    ".json": load_targets_json,
+    ".json.gz": load_targets_json,
+}
+
+
+def _try_canonicalize(
+    smiles: str, canonicalize: Callable[[str], SmilesStr] = canonicalize_smiles_cached
+) -> SmilesStr | UrsaException:
+    """Returns the error instead of raising it, so one bad SMILES does not tear down a worker pool."""
+    try:
+        return canonicalize(smiles)
+    except UrsaException as e:
+        return e
+
+
+def _canonicalize_in_pool(
+    smiles_list: list[str], max_workers: int, smiles_cache: SmilesCache | None
+) -> list[SmilesStr | UrsaException]:
+    """Canonicalizes `smiles_list` across processes, serving and filling `smiles_cache` from the main process."""
+    results: list[SmilesStr | UrsaException | None] = [None] * len(smiles_list)
+    misses: list[int] = []
+    for i, smiles in enumerate(smiles_list):
+        if smiles_cache is not None and isinstance(smiles, str) and smiles:
+            try:
+                results[i] = smiles_cache.get(smiles)
+            except InvalidSmilesError as e:
+                results[i] = e
+        if results[i] is None:
+            misses.append(i)
+    if not misses:
+        # a fully warm cache (the usual re-run) needs no worker processes at all
+        return [canon for canon in results if canon is not None]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        canon_results = executor.map(_try_canonicalize, [smiles_list[i] for i in misses], chunksize=64)
+        for i, canon in zip(misses, canon_results, strict=True):
+            results[i] = canon
+            if smiles_cache is not None and isinstance(smiles_list[i], str) and smiles_list[i]:
+                if isinstance(canon, InvalidSmilesError):
+                    smiles_cache.put(smiles_list[i], None)
+                elif not isinstance(canon, UrsaException):
+                    smiles_cache.put(smiles_list[i], canon)
+    return [canon for canon in results if canon is not None]
+
+
+def load_and_prepare_targets(
+    file_path: Path, smiles_cache: SmilesCache | None = None, max_workers: int = 1
+) -> dict[str, TargetInfo]:
     """
     Loads a file containing target IDs and SMILES, canonicalizes the SMILES,
     and prepares a dictionary of TargetInfo objects.
+
+    If a `smiles_cache` is given, canonical SMILES are looked up there first
+    and any newly canonicalized SMILES are added to it. With `max_workers` > 1,
+    SMILES that miss the cache are canonicalized in a process pool; this only
+    pays off for target sets in the thousands.
     """
     logger.info(f"Loading and preparing targets from {file_path}...")
 
     try:
-        if file_path.suffix == ".csv":
-            targets_raw = load_targets_csv(file_path)
-        elif file_path.suffix == ".json" or (file_path.suffix == ".gz" and file_path.stem.endswith(".json")):
-            targets_raw = load_targets_json(file_path)
-        else:
+        suffix = file_path.suffix
+        if suffix == ".gz":
+            suffix = Path(file_path.stem).suffix + suffix
+        loader = _TARGET_LOADERS.get(suffix)
+        if loader is None:
             raise UrsaException(f"Unsupported file format: {file_path}")
+        targets_raw = loader(file_path)
     except UrsaIOException:
         # Let IO exceptions propagate with their specific type.
         raise
 
+    canon_results: Iterable[SmilesStr | UrsaException]
+    if max_workers > 1:
+        canon_results = _canonicalize_in_pool(list(targets_raw.values()), max_workers, smiles_cache)
+    else:
+        canonicalize = smiles_cache.canonicalize if smiles_cache is not None else canonicalize_smiles_cached
+        canon_results = (_try_canonicalize(raw_smiles, canonicalize) for raw_smiles in targets_raw.values())
+
     prepared_targets: dict[str, TargetInfo] = {}
-    for target_id, raw_smiles in targets_raw.items():
-        try:
-            canon_smiles = canonicalize_smiles(raw_smiles)
-            prepared_targets[target_id] = TargetInfo(id=target_id, smiles=canon_smiles)
-        except UrsaException as e:
+    for (target_id, raw_smiles), canon_smiles in zip(targets_raw.items(), canon_results, strict=True):
+        if isinstance(canon_smiles, UrsaException):
             msg = f"Invalid SMILES for target '{target_id}': {raw_smiles}. Cannot proceed."
             logger.error(msg)
             # **THE FIX IS HERE**: Raise a new exception with the better message.
-            raise UrsaException(msg) from e
+            raise UrsaException(msg) from canon_smiles
+        prepared_targets[target_id] = TargetInfo(id=target_id, smiles=canon_smiles)
 
     logger.info(f"Successfully prepared {len(prepared_targets)} targets.")
     return prepared_targets
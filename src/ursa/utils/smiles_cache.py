@@ -0,0 +1,123 @@
+import sqlite3
+from pathlib import Path
+from types import TracebackType
+
+from ursa.domain.chem import canonicalize_smiles, rdkit_version
+from ursa.exceptions import InvalidSmilesError, UrsaIOException
+from ursa.typing import SmilesStr
+from ursa.utils.logging import logger
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS cache (raw TEXT PRIMARY KEY, canon TEXT, invalid INT NOT NULL)"
+_META_SCHEMA = "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+
+
+class SmilesCache:
+    """
+    A persistent, on-disk cache mapping raw SMILES to their canonical form.
+
+    Canonicalization through RDKit is the dominant cost when the same stocks and
+    target sets are processed over and over. This cache survives across runs, so
+    each raw SMILES only ever goes through RDKit once. SMILES that fail to parse
+    are remembered too, and raise `InvalidSmilesError` again on lookup.
+
+    Canonical forms can change between RDKit releases, so the cache records the
+    RDKit version that filled it and is emptied when opened under another one
+    (or when it predates version tracking).
+
+    Usage:
+        with SmilesCache(Path("data/cache/smiles.sqlite")) as cache:
+            canon = cache.canonicalize("OCC")
+    """
+
+    def __init__(self, path: Path, commit_every: int = 1000) -> None:
+        self.path = path
+        self.commit_every = commit_every
+        self._pending = 0
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path)
+            self._conn.execute(_SCHEMA)
+            self._conn.execute(_META_SCHEMA)
+            self._drop_if_stale()
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Failed to open SMILES cache at {path}")
+            raise UrsaIOException(f"Could not open SMILES cache {path}: {e}") from e
+
+    def _drop_if_stale(self) -> None:
+        """Empties the cache unless it was filled by the RDKit version running now."""
+        current = rdkit_version()
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'rdkit_version'").fetchone()
+        if row is not None and row[0] == current:
+            return
+        if row is not None:
+            logger.warning(f"SMILES cache {self.path} was built with RDKit {row[0]}, now {current}; clearing it")
+        self._conn.execute("DELETE FROM cache")
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('rdkit_version', ?)", (current,))
+        self._conn.commit()
+
+    def get(self, smiles: str) -> SmilesStr | None:
+        """
+        Looks up a raw SMILES in the cache.
+
+        Returns:
+            The cached canonical SMILES, or None if the SMILES has not been seen.
+
+        Raises:
+            InvalidSmilesError: If the SMILES is cached as invalid.
+        """
+        row = self._conn.execute("SELECT canon, invalid FROM cache WHERE raw = ?", (smiles,)).fetchone()
+        if row is None:
+            return None
+        canon, invalid = row
+        if invalid:
+            raise InvalidSmilesError(f"Invalid SMILES string: {smiles}")
+        return SmilesStr(canon)
+
+    def put(self, smiles: str, canonical: SmilesStr | None) -> None:
+        """
+        Records the canonical form of a raw SMILES. Passing None marks it as invalid.
+
+        The canonical form is also stored as its own key, so later lookups of
+        already-canonical SMILES are hits as well.
+        """
+        rows = [(smiles, canonical, int(canonical is None))]
+        if canonical is not None and canonical != smiles:
+            rows.append((canonical, canonical, 0))
+        self._conn.executemany("INSERT OR IGNORE INTO cache (raw, canon, invalid) VALUES (?, ?, ?)", rows)
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.commit()
+
+    def canonicalize(self, smiles: str) -> SmilesStr:
+        """A drop-in replacement for `canonicalize_smiles` that consults the cache first."""
+        if not isinstance(smiles, str) or not smiles:
+            # let the uncached function raise the usual error, there is nothing worth caching here
+            return canonicalize_smiles(smiles)
+        cached = self.get(smiles)
+        if cached is not None:
+            return cached
+        try:
+            canon = canonicalize_smiles(smiles)
+        except InvalidSmilesError:
+            self.put(smiles, None)
+            raise
+        self.put(smiles, canon)
+        return canon
+
+    def commit(self) -> None:
+        """Flushes pending inserts to disk."""
+        self._conn.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        """Commits any pending inserts and closes the underlying connection."""
+        self.commit()
+        self._conn.close()
+
+    def __enter__(self) -> "SmilesCache":
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None
+    ) -> None:
+        self.close()
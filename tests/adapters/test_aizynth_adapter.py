@@ -1,9 +1,13 @@
+import logging
+
 import pytest
 
 from ursa.adapters.aizynth_adapter import AizynthAdapter
 from ursa.domain.schemas import TargetInfo
 from ursa.typing import SmilesStr
 
+pytestmark = pytest.mark.usefixtures("_warm_rdkit")
+
 
 # fmt:off
 @pytest.fixture
@@ -53,7 +57,7 @@ def aizynth_raw_output_branched() -> list[dict]:
 # fmt:on
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def target_info() -> TargetInfo:
     """
     FIXED: The SMILES string now matches the one RDKit produces, resolving the mismatch.
@@ -148,44 +152,53 @@ def test_successful_transformation_branched(aizynth_raw_output_branched, target_
     assert sorted_r3[1].is_starting_material
 
 
+def _logged(caplog: pytest.LogCaptureFixture, text: str) -> bool:
+    """Checks the raw messages of captured records, skipping the log formatter that `caplog.text` runs."""
+    return any(text in message for message in caplog.messages)
+
+
 def test_adapter_handles_malformed_input(target_info, caplog):
     """Tests that the adapter logs a warning and returns no results for bad data."""
+    caplog.set_level(logging.WARNING, logger="ursa")
     malformed_data = [{"type": "mol", "not_a_smiles_field": "foo"}]
     adapter = AizynthAdapter()
     results = list(adapter.adapt(malformed_data, target_info))
 
     assert len(results) == 0
-    assert "failed AiZynth schema validation" in caplog.text
+    assert _logged(caplog, "failed AiZynth schema validation")
 
 
 def test_adapter_handles_invalid_smiles_in_tree(aizynth_raw_output, target_info, caplog):
     """An invalid smiles deep in the tree should cause that route to fail, but not crash."""
+    caplog.set_level(logging.WARNING, logger="ursa")
     aizynth_raw_output[0]["children"][0]["children"][0]["smiles"] = "invalid"
     adapter = AizynthAdapter()
     results = list(adapter.adapt(aizynth_raw_output, target_info))
 
     assert len(results) == 0
-    assert "failed transformation" in caplog.text
-    assert "Invalid SMILES string" in caplog.text
+    assert _logged(caplog, "failed transformation")
+    assert _logged(caplog, "Invalid SMILES string")
 
 
 def test_adapter_handles_mismatched_target_smiles(aizynth_raw_output, caplog):
     """If the transformed root SMILES doesn't match the target, it's a logic error."""
+    caplog.set_level(logging.WARNING, logger="ursa")
     mismatched_target_info = TargetInfo(smiles=SmilesStr("CC"), id="test_target_1")
     adapter = AizynthAdapter()
     results = list(adapter.adapt(aizynth_raw_output, mismatched_target_info))
 
     assert len(results) == 0
     # FIXED: The assertion now correctly checks for the logged error message.
-    assert "Mismatched SMILES for target" in caplog.text
+    assert _logged(caplog, "Mismatched SMILES for target")
 
 
 def test_adapter_handles_broken_bipartite_graph(aizynth_raw_output, target_info, caplog):
     """Test that a mol node having a mol child raises a logic error."""
+    caplog.set_level(logging.WARNING, logger="ursa")
     # Sabotage the graph: make a molecule a child of a molecule
     aizynth_raw_output[0]["children"][0] = {"type": "mol", "smiles": "CC"}
     adapter = AizynthAdapter()
     results = list(adapter.adapt(aizynth_raw_output, target_info))
 
     assert len(results) == 0
-    assert "Child of molecule node was not a reaction node" in caplog.text
+    assert _logged(caplog, "Child of molecule node was not a reaction node")
@@ -7,6 +7,8 @@ from ursa.domain.chem import canonicalize_smiles
 from ursa.domain.schemas import BenchmarkTree, TargetInfo
 from ursa.exceptions import AdapterLogicError
 
+pytestmark = pytest.mark.usefixtures("_warm_rdkit")
+
 
 def test_adapt_happy_path_aspirin(
     dms_adapter: DMSAdapter,
@@ -2,9 +2,11 @@ from unittest.mock import patch
 
 import pytest
 
-from ursa.domain.chem import canonicalize_smiles, get_inchi_key
+from ursa.domain.chem import canonicalize_smiles, canonicalize_smiles_cached, get_inchi_key
 from ursa.exceptions import InvalidSmilesError, UrsaException
 
+pytestmark = pytest.mark.usefixtures("_warm_rdkit")
+
 
 def test_canonicalize_smiles_valid_non_canonical() -> None:
     """Tests that a valid, non-canonical SMILES is correctly canonicalized."""
@@ -159,7 +161,7 @@ def test_get_inchi_key_bad_input_raises_error(bad_input) -> None:
         get_inchi_key(bad_input)
 
 
-@patch("ursa.domain.chem.Chem.MolToSmiles")
+@patch("rdkit.Chem.MolToSmiles")
 def test_canonicalize_smiles_raises_ursa_exception_on_generic_error(mock_moltosmiles) -> None:
     """
     tests that a generic, unexpected rdkit error is wrapped in our UrsaException.
@@ -175,7 +177,7 @@ def test_canonicalize_smiles_raises_ursa_exception_on_generic_error(mock_moltosm
     assert "An unexpected error occurred during SMILES processing" in str(exc_info.value)
 
 
-@patch("ursa.domain.chem.Chem.MolToInchiKey")
+@patch("rdkit.Chem.MolToInchiKey")
 def test_get_inchi_key_raises_ursa_exception_on_empty_result(mock_moltoinchikey) -> None:
     """
     tests that our guard for an empty inchikey from rdkit works.
@@ -191,7 +193,7 @@ def test_get_inchi_key_raises_ursa_exception_on_empty_result(mock_moltoinchikey)
     assert "produced an empty InChIKey" in str(exc_info.value)
 
 
-@patch("ursa.domain.chem.Chem.MolToInchiKey")
+@patch("rdkit.Chem.MolToInchiKey")
 def test_get_inchi_key_raises_ursa_exception_on_generic_error(mock_moltoinchikey) -> None:
     """
     tests that a generic, unexpected rdkit error is wrapped in our UrsaException.
@@ -205,3 +207,48 @@ def test_get_inchi_key_raises_ursa_exception_on_generic_error(mock_moltoinchikey
         get_inchi_key("CCO")
 
     assert "An unexpected error occurred during InChIKey generation" in str(exc_info.value)
+
+
+def test_canonicalize_smiles_cached_reuses_result() -> None:
+    """tests that a repeated SMILES is served from the cache without touching rdkit."""
+    # arrange: warm the cache with a smiles no other test uses
+    first = canonicalize_smiles_cached("OCCCC")
+
+    # act: a second call must not reach rdkit, which is now broken
+    with patch("rdkit.Chem.MolToSmiles", side_effect=RuntimeError("should not be called")):
+        second = canonicalize_smiles_cached("OCCCC")
+
+    # assert
+    assert first == second == "CCCCO"
+
+
+@pytest.mark.parametrize("bad_input", ["", None, ["CCO"], "this is not a smiles"])
+def test_canonicalize_smiles_cached_raises_like_uncached(bad_input) -> None:
+    """tests that the cached variant raises the same specific exception for bad input, every time."""
+    for _ in range(2):
+        with pytest.raises(InvalidSmilesError):
+            canonicalize_smiles_cached(bad_input)
+
+
+def test_canonicalize_smiles_cached_seeds_canonical_form() -> None:
+    """tests that after canonicalizing a raw smiles, its canonical form is a cache hit too."""
+    # arrange
+    canon = canonicalize_smiles_cached("OCCCCC")
+
+    # act
+    with patch("rdkit.Chem.MolToSmiles", side_effect=RuntimeError("should not be called")):
+        result = canonicalize_smiles_cached(canon)
+
+    # assert
+    assert result == canon == "CCCCCO"
+
+
+def test_canonicalize_smiles_cached_interns_canonical_form() -> None:
+    """tests that different spellings of one molecule return the very same string object."""
+    # act
+    first = canonicalize_smiles_cached("OCCCCCC")
+    second = canonicalize_smiles_cached("C(O)CCCCC")
+
+    # assert
+    assert first == "CCCCCCO"
+    assert first is second
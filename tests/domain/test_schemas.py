@@ -123,3 +123,41 @@ def test_benchmark_tree_parses_valid_structure(aspirin_target_info: TargetInfo)
     assert benchmark_tree.retrosynthetic_tree.smiles == aspirin_target_info.smiles
     assert len(benchmark_tree.retrosynthetic_tree.reactions) == 1
     assert len(benchmark_tree.retrosynthetic_tree.reactions[0].reactants) == 2
+
+
+def test_output_nodes_are_frozen_and_reject_unknown_fields() -> None:
+    """
+    Tests that validated nodes cannot be reassigned and that unexpected
+    fields are rejected instead of silently dropped.
+    """
+    # Arrange
+    node = MoleculeNode(id="m", molecule_hash="hash1", smiles="CCO", is_starting_material=True, reactions=[])
+
+    # Act / Assert
+    with pytest.raises(ValidationError, match="frozen"):
+        node.id = "other"  # type: ignore[misc]
+    with pytest.raises(ValidationError, match="Extra inputs are not permitted"):
+        TargetInfo.model_validate({"id": "t", "smiles": "CCO", "name": "ethanol"})
+    assert node.model_copy(update={"id": "other"}).id == "other"
+    # frozen nodes still hold lists, so they are not hashable; only TargetInfo is
+    with pytest.raises(TypeError, match="unhashable"):
+        hash(node)
+    assert hash(TargetInfo(id="t", smiles="CCO")) == hash(TargetInfo(id="t", smiles="CCO"))
+
+
+def test_molecule_identity_fields_are_interned() -> None:
+    """Tests that equal molecule hashes and SMILES built from separate strings end up as the same objects."""
+    # Arrange
+    hash_a = "".join(["sha256-", "abc"])
+    hash_b = "".join(["sha256-", "abc"])
+    assert hash_a is not hash_b
+
+    # Act
+    node_a = MoleculeNode(id="a", molecule_hash=hash_a, smiles="".join(["CC", "O"]), is_starting_material=True)
+    node_b = MoleculeNode.model_validate_json(
+        '{"id":"b","molecule_hash":"sha256-abc","smiles":"CCO","is_starting_material":true}'
+    )
+
+    # Assert
+    assert node_a.molecule_hash is node_b.molecule_hash
+    assert node_a.smiles is node_b.smiles
@@ -1,7 +1,7 @@
 # tests/test_tree.py
 
 from ursa.domain.schemas import BenchmarkTree, MoleculeNode, ReactionNode, TargetInfo
-from ursa.domain.tree import deduplicate_routes
+from ursa.domain.tree import _generate_tree_signature, deduplicate_routes
 from ursa.utils.hashing import generate_molecule_hash
 
 
@@ -332,9 +332,8 @@ def test_deduplicate_handles_identical_subtrees_in_different_branches() -> None:
     # We must build them as separate objects even if they are identical
     # to simulate a real tree traversal.
     subtree1 = _build_simple_tree("C", ["A", "B"]).retrosynthetic_tree
-    subtree2 = _build_simple_tree("C", ["A", "B"]).retrosynthetic_tree
     # Make their IDs different to be more realistic
-    subtree2.id = "root-clone"
+    subtree2 = _build_simple_tree("C", ["A", "B"]).retrosynthetic_tree.model_copy(update={"id": "root-clone"})
 
     # --- Build two identical final routes using these sub-trees ---
     route1_reaction = ReactionNode(id="r1-rxn", reaction_smiles="C.C>>T", reactants=[subtree1, subtree2])
@@ -364,3 +363,63 @@ def test_deduplicate_handles_identical_subtrees_in_different_branches() -> None:
 
     # Assert
     assert len(unique_routes) == 1
+
+
+def test_tree_signature_memo_matches_unmemoized() -> None:
+    """Tests that a shared content-keyed memo gives the same signatures as computing from scratch."""
+
+    # Arrange
+    # (A+B>>C) + D >> T and (B+A>>C) + E >> T, built bottom-up so every node is validated
+    def build_route(intermediate_reactants: list[str], other_smiles: str) -> BenchmarkTree:
+        intermediate = _build_simple_tree("C", intermediate_reactants).retrosynthetic_tree
+        other = MoleculeNode(
+            id="root-1",
+            molecule_hash=generate_molecule_hash(other_smiles),
+            smiles=other_smiles,
+            is_starting_material=True,
+        )
+        reaction = ReactionNode(id="rxn-root", reaction_smiles=f"C.{other_smiles}>>T", reactants=[intermediate, other])
+        root = MoleculeNode(
+            id="root",
+            molecule_hash=generate_molecule_hash("T"),
+            smiles="T",
+            is_starting_material=False,
+            reactions=[reaction],
+        )
+        return BenchmarkTree(target=TargetInfo(id="T", smiles="T"), retrosynthetic_tree=root)
+
+    route1 = build_route(["A", "B"], "D")
+    route2 = build_route(["B", "A"], "E")
+    memo: dict[tuple[str | bytes, ...], bytes] = {}
+
+    # Act
+    memoized = [_generate_tree_signature(r.retrosynthetic_tree, memo) for r in (route1, route2)]
+    fresh = [_generate_tree_signature(r.retrosynthetic_tree) for r in (route1, route2)]
+
+    # Assert
+    assert memoized == fresh
+    assert memoized[0] != memoized[1]
+    assert len(memo) == 3  # C is signed once, plus one entry per distinct root
+
+
+def test_tree_signature_handles_routes_deeper_than_recursion_limit() -> None:
+    """Tests that signing a very deep linear route does not hit python's recursion limit."""
+    # Arrange: a chain of 2000 one-reactant steps
+    node = MoleculeNode(
+        id="leaf", molecule_hash=generate_molecule_hash("A"), smiles="A", is_starting_material=True, reactions=[]
+    )
+    for depth in range(2000):
+        reaction = ReactionNode(id=f"rxn-{depth}", reaction_smiles=f"{node.smiles}>>C{depth}", reactants=[node])
+        node = MoleculeNode(
+            id=f"mol-{depth}",
+            molecule_hash=generate_molecule_hash(f"C{depth}"),
+            smiles=f"C{depth}",
+            is_starting_material=False,
+            reactions=[reaction],
+        )
+
+    # Act
+    signature = _generate_tree_signature(node)
+
+    # Assert
+    assert len(signature) == 16
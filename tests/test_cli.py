@@ -0,0 +1,129 @@
+import csv
+import os
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from ursa.cli import main
+from ursa.io import save_json_gz
+
+pytestmark = pytest.mark.usefixtures("_warm_rdkit")
+
+
+@pytest.fixture
+def processed_dms_run(tmp_path: Path, raw_dms_aspirin_data: list[dict]) -> tuple[Path, Path]:
+    """Runs `ursa process dms` on a one-target raw file and returns (manifest path, raw dir)."""
+    raw_dir = tmp_path / "raw"
+    raw_file = raw_dir / "results.json.gz"
+    save_json_gz({"aspirin": raw_dms_aspirin_data}, raw_file)
+
+    targets_file = tmp_path / "targets.csv"
+    with targets_file.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Structure ID", "SMILES"])
+        writer.writerow(["aspirin", "CC(=O)OC1=CC=CC=C1C(=O)O"])
+
+    processed_dir = tmp_path / "processed"
+    exit_code = main(
+        [
+            "process",
+            "dms",
+            "--model-name",
+            "dms-test",
+            "--raw-file",
+            str(raw_file),
+            "--output-dir",
+            str(processed_dir),
+            "--targets-file",
+            str(targets_file),
+        ]
+    )
+    assert exit_code == 0
+    (manifest_path,) = processed_dir.glob("*-manifest.json")
+    return manifest_path, raw_dir
+
+
+def test_process_then_verify_roundtrip(processed_dms_run: tuple[Path, Path]) -> None:
+    """Tests that a freshly processed run verifies against its own raw files."""
+    manifest_path, raw_dir = processed_dms_run
+    assert (manifest_path.parent / manifest_path.name.replace("-manifest.json", "-results.json.gz")).exists()
+    assert main(["verify", "--manifest", str(manifest_path), "--raw-dir", str(raw_dir)]) == 0
+
+
+def test_verify_fails_when_raw_file_changes(processed_dms_run: tuple[Path, Path]) -> None:
+    """Tests that tampering with a raw source file fails verification."""
+    manifest_path, raw_dir = processed_dms_run
+    save_json_gz({"aspirin": []}, raw_dir / "results.json.gz")
+    assert main(["verify", "--manifest", str(manifest_path), "--raw-dir", str(raw_dir)]) == 1
+
+
+def test_verify_fails_when_raw_file_missing(processed_dms_run: tuple[Path, Path], tmp_path: Path) -> None:
+    """Tests that a missing raw source file fails verification."""
+    manifest_path, _ = processed_dms_run
+    empty_dir = tmp_path / "empty"
+    empty_dir.mkdir()
+    assert main(["verify", "--manifest", str(manifest_path), "--raw-dir", str(empty_dir)]) == 1
+
+
+def test_verify_fails_on_malformed_manifest(tmp_path: Path) -> None:
+    """Tests that an unparsable manifest is reported instead of raising."""
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text("{not json")
+    assert main(["verify", "--manifest", str(manifest_path), "--raw-dir", str(tmp_path)]) == 1
+
+
+def test_process_fails_on_bad_targets_file(tmp_path: Path) -> None:
+    """Tests that an unsupported targets file yields a non-zero exit code."""
+    targets_file = tmp_path / "targets.txt"
+    targets_file.write_text("aspirin CCO")
+    args = ["process", "aizynth", "--model-name", "m", "--raw-file", str(tmp_path / "raw.json.gz")]
+    args += ["--output-dir", str(tmp_path / "out"), "--targets-file", str(targets_file)]
+    assert main(args) == 1
+
+
+def test_verify_rereads_files_tampered_with_preserved_mtime(processed_dms_run: tuple[Path, Path]) -> None:
+    """Tests that verify in the same process rehashes from disk instead of trusting the per-process cache."""
+    # Arrange: flip one byte, keeping the size and restoring the mtime the process step hashed
+    manifest_path, raw_dir = processed_dms_run
+    raw_file = raw_dir / "results.json.gz"
+    stat = raw_file.stat()
+    content = bytearray(raw_file.read_bytes())
+    content[-1] ^= 0xFF
+    raw_file.write_bytes(bytes(content))
+    os.utime(raw_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    # Act / Assert
+    assert main(["verify", "--manifest", str(manifest_path), "--raw-dir", str(raw_dir)]) == 1
+
+
+def test_process_resolves_relative_paths_against_base_dir(tmp_path: Path, raw_dms_aspirin_data: list[dict]) -> None:
+    """Tests that --base-dir anchors relative paths, as the per-model wrapper scripts rely on."""
+    # Arrange
+    save_json_gz({"aspirin": raw_dms_aspirin_data}, tmp_path / "raw" / "results.json.gz")
+    with (tmp_path / "targets.csv").open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Structure ID", "SMILES"])
+        writer.writerow(["aspirin", "CC(=O)OC1=CC=CC=C1C(=O)O"])
+    args = ["process", "dms", "--base-dir", str(tmp_path), "--model-name", "dms-test"]
+    args += ["--raw-file", "raw/results.json.gz", "--output-dir", "processed", "--targets-file", "targets.csv"]
+
+    # Act
+    exit_code = main(args)
+
+    # Assert
+    assert exit_code == 0
+    assert len(list((tmp_path / "processed").glob("*-manifest.json"))) == 1
+
+
+def test_process_reports_unexpected_errors(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Tests that a non-ursa exception is logged and turned into a non-zero exit code."""
+    # Arrange
+    targets_file = tmp_path / "targets.csv"
+    targets_file.write_text("Structure ID,SMILES\naspirin,CCO\n")
+    mocker.patch("ursa.core.process_model_run", side_effect=RuntimeError("boom"))
+    args = ["process", "dms", "--model-name", "m", "--raw-file", str(tmp_path / "raw.json.gz")]
+    args += ["--output-dir", str(tmp_path / "out"), "--targets-file", str(targets_file)]
+
+    # Act / Assert
+    assert main(args) == 1
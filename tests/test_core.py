@@ -3,12 +3,15 @@
 import json
 from pathlib import Path
 
+import pytest
 from pytest_mock import MockerFixture
 
 from ursa.adapters.base_adapter import BaseAdapter
 from ursa.core import process_model_run
 from ursa.domain.schemas import BenchmarkTree, TargetInfo
-from ursa.io import save_json_gz  # <-- Import our helper
+from ursa.io import load_json_gz, save_json_gz
+
+pytestmark = pytest.mark.usefixtures("_warm_rdkit")
 
 
 def test_process_model_run_happy_path(tmp_path: Path, mocker: MockerFixture, aspirin_target_info: TargetInfo) -> None:
@@ -100,3 +103,110 @@ def test_process_model_run_happy_path(tmp_path: Path, mocker: MockerFixture, asp
 
     results_file_path = processed_dir / manifest["results_file"]
     assert results_file_path.exists()
+
+
+def test_process_model_run_skips_already_processed_run(
+    tmp_path: Path, mocker: MockerFixture, aspirin_target_info: TargetInfo
+) -> None:
+    """
+    Tests that a second run over the same raw file and model name is skipped,
+    and that force=True reprocesses it.
+    """
+    # 1. ARRANGE
+    raw_file_path = tmp_path / "raw" / "target_aspirin.json.gz"
+    save_json_gz({"aspirin": []}, raw_file_path)
+    processed_dir = tmp_path / "processed"
+    mock_adapter_instance = mocker.MagicMock(spec=BaseAdapter)
+    mock_adapter_instance.adapt.side_effect = lambda *_: iter([])
+    run_kwargs = {
+        "model_name": "test_model_v1",
+        "adapter": mock_adapter_instance,
+        "raw_results_file": raw_file_path,
+        "processed_dir": processed_dir,
+        "targets_map": {"aspirin": aspirin_target_info},
+    }
+
+    # 2. ACT
+    process_model_run(**run_kwargs)
+    process_model_run(**run_kwargs)
+    calls_after_rerun = mock_adapter_instance.adapt.call_count
+    process_model_run(**run_kwargs, force=True)
+
+    # 3. ASSERT
+    assert calls_after_rerun == 1
+    assert mock_adapter_instance.adapt.call_count == 2
+    assert len(list(processed_dir.glob("*-manifest.json"))) == 1
+
+
+def test_process_model_run_reprocesses_when_results_file_is_missing(
+    tmp_path: Path, mocker: MockerFixture, aspirin_target_info: TargetInfo
+) -> None:
+    """Tests that a run whose manifest survives but whose results file was deleted is processed again."""
+    # 1. ARRANGE
+    raw_file_path = tmp_path / "raw" / "target_aspirin.json.gz"
+    save_json_gz({"aspirin": [{"smiles": "...", "children": []}]}, raw_file_path)
+    processed_dir = tmp_path / "processed"
+    fake_tree = BenchmarkTree.model_validate(
+        {
+            "target": aspirin_target_info.model_dump(),
+            "retrosynthetic_tree": {
+                "id": "root",
+                "molecule_hash": "hash_aspirin",
+                "smiles": aspirin_target_info.smiles,
+                "is_starting_material": True,
+                "reactions": [],
+            },
+        }
+    )
+    mock_adapter_instance = mocker.MagicMock(spec=BaseAdapter)
+    mock_adapter_instance.adapt.side_effect = lambda *_: iter([fake_tree])
+    run_kwargs = {
+        "model_name": "test_model_v1",
+        "adapter": mock_adapter_instance,
+        "raw_results_file": raw_file_path,
+        "processed_dir": processed_dir,
+        "targets_map": {"aspirin": aspirin_target_info},
+    }
+    process_model_run(**run_kwargs)
+    results_files = list(processed_dir.glob("*-results.json.gz"))
+    assert len(results_files) == 1
+    results_files[0].unlink()
+
+    # 2. ACT
+    process_model_run(**run_kwargs)
+
+    # 3. ASSERT
+    assert mock_adapter_instance.adapt.call_count == 2
+    assert results_files[0].is_file()
+
+
+def test_process_model_run_in_pool_matches_serial(
+    tmp_path: Path,
+    dms_adapter: BaseAdapter,
+    raw_dms_aspirin_data: list[dict],
+    raw_dms_vonoprazan_data: list[dict],
+    aspirin_target_info: TargetInfo,
+    vonoprazan_target_info: TargetInfo,
+) -> None:
+    """
+    Tests that adapting targets in a process pool writes the same results as a serial run.
+    """
+    # 1. ARRANGE
+    raw_file_path = tmp_path / "raw" / "results.json.gz"
+    save_json_gz({"aspirin": raw_dms_aspirin_data, "vonoprazan": raw_dms_vonoprazan_data}, raw_file_path)
+    run_kwargs = {
+        "model_name": "dms_test",
+        "adapter": dms_adapter,
+        "raw_results_file": raw_file_path,
+        "targets_map": {"aspirin": aspirin_target_info, "vonoprazan": vonoprazan_target_info},
+    }
+
+    # 2. ACT
+    process_model_run(**run_kwargs, processed_dir=tmp_path / "serial")
+    process_model_run(**run_kwargs, processed_dir=tmp_path / "pool", max_workers=2)
+
+    # 3. ASSERT
+    (serial_results,) = (tmp_path / "serial").glob("*-results.json.gz")
+    (pool_results,) = (tmp_path / "pool").glob("*-results.json.gz")
+    assert load_json_gz(pool_results) == load_json_gz(serial_results)
+    assert list(load_json_gz(pool_results)) == ["aspirin", "vonoprazan"]
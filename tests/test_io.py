@@ -14,21 +14,27 @@ from pytest import MonkeyPatch
 
 from ursa.exceptions import UrsaException, UrsaIOException, UrsaSerializationError
 from ursa.io import (
+    JsonGzWriter,
     load_and_prepare_targets,
+    load_json,
     load_json_gz,
+    load_json_gz_many,
     load_targets_csv,
     load_targets_json,
     save_json,
     save_json_gz,
 )
 
+pytestmark = pytest.mark.usefixtures("_warm_rdkit")
+
 VALID_TARGET_DATA = {"target_abc": "CCO", "target_xyz": "c1ccccc1"}
 
 
-@pytest.fixture
-def valid_csv_file(tmp_path: Path) -> Path:
+# Target files are written once per module: tests only read them.
+@pytest.fixture(scope="module")
+def valid_csv_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
     """Create a CSV file with two valid target rows."""
-    file_path = tmp_path / "targets.csv"
+    file_path = tmp_path_factory.mktemp("targets") / "targets.csv"
     with file_path.open("w", newline="") as f:
         writer = csv.writer(f)
         writer.writerow(["Structure ID", "SMILES"])
@@ -37,18 +43,18 @@ def valid_csv_file(tmp_path: Path) -> Path:
     return file_path
 
 
-@pytest.fixture
-def valid_json_file(tmp_path: Path) -> Path:
+@pytest.fixture(scope="module")
+def valid_json_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
     """Create an uncompressed JSON file with two valid targets."""
-    file_path = tmp_path / "targets.json"
+    file_path = tmp_path_factory.mktemp("targets") / "targets.json"
     file_path.write_text(json.dumps(VALID_TARGET_DATA))
     return file_path
 
 
-@pytest.fixture
-def valid_json_gz_file(tmp_path: Path) -> Path:
+@pytest.fixture(scope="module")
+def valid_json_gz_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
     """Create a gzipped JSON file with two valid targets."""
-    file_path = tmp_path / "targets.json.gz"
+    file_path = tmp_path_factory.mktemp("targets") / "targets.json.gz"
     save_json_gz(VALID_TARGET_DATA, file_path)
     return file_path
 
@@ -61,6 +67,56 @@ def test_save_and_load_json_gz_roundtrip(tmp_path: Path) -> None:
     assert load_json_gz(file_path) == data
 
 
+def test_load_json_gz_many_preserves_order(tmp_path: Path) -> None:
+    """Loading several gzipped JSON files returns them in the order requested."""
+    paths = [tmp_path / f"part{i}.json.gz" for i in range(4)]
+    for i, path in enumerate(paths):
+        save_json_gz({"part": i}, path)
+    assert load_json_gz_many(paths[::-1]) == [{"part": i} for i in reversed(range(4))]
+
+
+def test_load_json_gz_many_raises_io_error(tmp_path: Path) -> None:
+    """A missing file among several raises UrsaIOException."""
+    good = tmp_path / "good.json.gz"
+    save_json_gz({"ok": True}, good)
+    with pytest.raises(UrsaIOException):
+        load_json_gz_many([good, tmp_path / "missing.json.gz"])
+
+
+def test_json_gz_writer_roundtrip(tmp_path: Path) -> None:
+    """Entries streamed through JsonGzWriter load back as one dict, in write order."""
+    data = {"t1": [{"a": 1}], 't"2': [], "t3": {"nested": [1, 2]}}
+    file_path = tmp_path / "out" / "streamed.json.gz"
+    with JsonGzWriter(file_path) as writer:
+        for key, value in data.items():
+            writer.write_entry(key, value)
+    assert writer.num_entries == 3
+    assert list(load_json_gz(file_path).items()) == list(data.items())
+
+
+def test_json_gz_writer_raw_entries(tmp_path: Path) -> None:
+    """Pre-serialized JSON values are written as is and mix with regular entries."""
+    file_path = tmp_path / "raw.json.gz"
+    with JsonGzWriter(file_path) as writer:
+        writer.write_raw_entry("raw", '[{"smiles":"CCO"}]')
+        writer.write_entry("plain", [1])
+    assert load_json_gz(file_path) == {"raw": [{"smiles": "CCO"}], "plain": [1]}
+
+
+def test_json_gz_writer_leaves_no_file_when_empty_or_failed(tmp_path: Path) -> None:
+    """No file is created without entries, and a partial file is removed when the block raises."""
+    empty_path = tmp_path / "empty.json.gz"
+    with JsonGzWriter(empty_path):
+        pass
+    assert not empty_path.exists()
+
+    failed_path = tmp_path / "failed.json.gz"
+    with pytest.raises(UrsaSerializationError), JsonGzWriter(failed_path) as writer:
+        writer.write_entry("ok", [1])
+        writer.write_entry("bad", {1, 2})
+    assert not failed_path.exists()
+
+
 def test_save_and_load_uncompressed_json_roundtrip(tmp_path: Path) -> None:
     """Ensure uncompressed JSON round-trip preserves manifest data."""
     manifest = {"run_hash": "abc-123", "model_name": "test"}
@@ -69,6 +125,17 @@ def test_save_and_load_uncompressed_json_roundtrip(tmp_path: Path) -> None:
     assert json.loads(file_path.read_text()) == manifest
 
 
+def test_load_json_roundtrip_and_rejects_non_dict(tmp_path: Path) -> None:
+    """Uncompressed JSON loads back as a dict; non-dict content raises UrsaIOException."""
+    manifest = {"run_hash": "abc-123", "model_name": "test"}
+    save_json(manifest, tmp_path / "manifest.json")
+    assert load_json(tmp_path / "manifest.json") == manifest
+
+    (tmp_path / "list.json").write_text("[1, 2, 3]")
+    with pytest.raises(UrsaIOException):
+        load_json(tmp_path / "list.json")
+
+
 def test_save_json_gz_creates_directories(tmp_path: Path) -> None:
     """Verify that save_json_gz creates missing parent directories."""
     file_path = tmp_path / "processed" / "run_1" / "results.json.gz"
@@ -90,6 +157,15 @@ def test_load_json_gz_raises_io_error_for_malformed_gzip(tmp_path: Path) -> None
         load_json_gz(file_path)
 
 
+def test_load_json_gz_raises_io_error_for_truncated_gzip(tmp_path: Path) -> None:
+    """Truncated gzip content raises UrsaIOException."""
+    file_path = tmp_path / "truncated.json.gz"
+    save_json_gz({"key": "value"}, file_path)
+    file_path.write_bytes(file_path.read_bytes()[:-10])
+    with pytest.raises(UrsaIOException):
+        load_json_gz(file_path)
+
+
 def test_save_json_gz_raises_serialization_error(tmp_path: Path) -> None:
     """Non-serializable objects raise UrsaSerializationError."""
     with pytest.raises(UrsaSerializationError):
@@ -109,6 +185,13 @@ def test_load_targets_csv_happy_path(valid_csv_file: Path):
     assert load_targets_csv(valid_csv_file) == VALID_TARGET_DATA
 
 
+def test_load_targets_csv_any_column_order_and_blank_lines(tmp_path: Path):
+    """CSV loader finds the columns by header name and skips blank lines."""
+    file_path = tmp_path / "reordered.csv"
+    file_path.write_text("SMILES,Extra,Structure ID\nCCO,x,target_abc\n\nc1ccccc1,y,target_xyz\n")
+    assert load_targets_csv(file_path) == VALID_TARGET_DATA
+
+
 def test_load_targets_csv_raises_on_missing_column(tmp_path: Path):
     """CSV loader raises when required columns are absent."""
     file_path = tmp_path / "bad_headers.csv"
@@ -189,6 +272,23 @@ def test_prepare_targets_raises_on_invalid_smiles(tmp_path: Path):
         load_and_prepare_targets(file_path)
 
 
+def test_prepare_targets_in_pool_matches_serial(valid_csv_file: Path):
+    """Canonicalizing targets in a process pool gives the same result as the serial path."""
+    assert load_and_prepare_targets(valid_csv_file, max_workers=2) == load_and_prepare_targets(valid_csv_file)
+
+
+def test_prepare_targets_in_pool_raises_on_invalid_smiles(tmp_path: Path):
+    """An invalid SMILES in the pool path raises UrsaException naming the target instead of killing the pool."""
+    file_path = tmp_path / "bad_smiles.csv"
+    with file_path.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Structure ID", "SMILES"])
+        writer.writerow(["good", "CCO"])
+        writer.writerow(["bad", "invalid"])
+    with pytest.raises(UrsaException, match="'bad'"):
+        load_and_prepare_targets(file_path, max_workers=2)
+
+
 def test_prepare_targets_propagates_io_error(tmp_path: Path):
     """Non-existent files raise UrsaIOException."""
     with pytest.raises(UrsaIOException):
@@ -2,9 +2,10 @@ import hashlib
 from pathlib import Path
 
 import pytest
+from pytest_mock import MockerFixture
 
 from ursa.exceptions import UrsaException
-from ursa.utils.hashing import generate_molecule_hash, generate_run_hash, get_file_hash
+from ursa.utils.hashing import generate_molecule_hash, generate_run_hash, get_file_hash, get_file_hashes
 
 
 def test_generate_molecule_hash_is_deterministic() -> None:
@@ -36,6 +37,22 @@ def test_generate_molecule_hash_is_sensitive() -> None:
     assert hash1 != hash2
 
 
+def test_generate_molecule_hash_serves_repeats_from_cache() -> None:
+    """Tests that a repeated SMILES is a cache hit and still yields the plain sha256 hash."""
+    # Arrange
+    smiles = "OCCCCCO"
+    first = generate_molecule_hash(smiles)
+    hits_before = generate_molecule_hash.cache_info().hits
+
+    # Act
+    second = generate_molecule_hash(smiles)
+
+    # Assert
+    assert generate_molecule_hash.cache_info().hits == hits_before + 1
+    assert second is first
+    assert second == f"sha256-{hashlib.sha256(smiles.encode()).hexdigest()}"
+
+
 def test_generate_run_hash_is_deterministic_and_order_invariant() -> None:
     """
     Tests that the run hash is deterministic and invariant to the order
@@ -70,6 +87,18 @@ def test_generate_run_hash_is_sensitive_to_model_name() -> None:
     assert run_hash_1 != run_hash_2
 
 
+def test_generate_run_hash_matches_concatenated_signature() -> None:
+    """Tests that run hashes stay compatible with existing manifests: sha256 over name + sorted hashes."""
+    # Arrange
+    expected_digest = hashlib.sha256(b"test-model" + b"hash_a" + b"hash_b").hexdigest()
+
+    # Act
+    run_hash = generate_run_hash("test-model", ["hash_b", "hash_a"])
+
+    # Assert
+    assert run_hash == f"ursa-run-{expected_digest}"
+
+
 def test_get_file_hash_is_correct(tmp_path: Path) -> None:
     """
     Tests that get_file_hash correctly computes the sha256 of a file's content.
@@ -95,3 +124,65 @@ def test_get_file_hash_raises_exception_for_missing_file(tmp_path: Path) -> None
     # Act / Assert
     with pytest.raises(UrsaException):
         get_file_hash(non_existent_path)
+
+
+def test_get_file_hash_handles_empty_file(tmp_path: Path) -> None:
+    """Tests that an empty file hashes to the sha256 of no bytes."""
+    # Arrange
+    file_path = tmp_path / "empty.txt"
+    file_path.write_bytes(b"")
+
+    # Act
+    calculated_hash = get_file_hash(file_path)
+
+    # Assert
+    assert calculated_hash == hashlib.sha256(b"").hexdigest()
+
+
+def test_get_file_hash_streams_large_files(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Tests that files above the small-file threshold are streamed through file_digest."""
+    # Arrange
+    content = b"x" * (256 * 1024)
+    file_path = tmp_path / "large.bin"
+    file_path.write_bytes(content)
+    spy = mocker.spy(hashlib, "file_digest")
+
+    # Act
+    calculated_hash = get_file_hash(file_path)
+
+    # Assert
+    assert calculated_hash == hashlib.sha256(content).hexdigest()
+    assert spy.call_count == 1
+
+
+def test_get_file_hash_caches_unchanged_files(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Tests that an unchanged file is read only once, and that rewriting it invalidates the cache."""
+    # Arrange
+    file_path = tmp_path / "raw.json.gz"
+    file_path.write_bytes(b"first")
+    first = get_file_hash(file_path)
+    spy = mocker.spy(Path, "read_bytes")
+
+    # Act
+    again = get_file_hash(file_path)
+    file_path.write_bytes(b"second, longer")
+    changed = get_file_hash(file_path)
+
+    # Assert
+    assert again == first
+    assert changed == hashlib.sha256(b"second, longer").hexdigest()
+    assert spy.call_count == 1
+
+
+def test_get_file_hashes_preserves_order(tmp_path: Path) -> None:
+    """Tests that hashing several files concurrently returns the digests in input order."""
+    # Arrange
+    paths = [tmp_path / f"part{i}.txt" for i in range(4)]
+    for i, path in enumerate(paths):
+        path.write_bytes(f"content {i}".encode())
+
+    # Act
+    hashes = get_file_hashes(paths)
+
+    # Assert
+    assert hashes == [hashlib.sha256(f"content {i}".encode()).hexdigest() for i in range(4)]
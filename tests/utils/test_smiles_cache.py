@@ -0,0 +1,162 @@
+import csv
+import sqlite3
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from ursa.exceptions import InvalidSmilesError
+from ursa.io import load_and_prepare_targets
+from ursa.utils.smiles_cache import SmilesCache
+
+pytestmark = pytest.mark.usefixtures("_warm_rdkit")
+
+
+def test_canonicalize_populates_cache(tmp_path: Path) -> None:
+    """Tests that a miss goes through RDKit and stores both the raw and the canonical form."""
+    # Arrange
+    cache = SmilesCache(tmp_path / "smiles.sqlite")
+
+    # Act
+    canon = cache.canonicalize("OCC")
+
+    # Assert
+    assert canon == "CCO"
+    assert cache.get("OCC") == "CCO"
+    assert cache.get("CCO") == "CCO"
+    cache.close()
+
+
+def test_get_returns_none_on_miss(tmp_path: Path) -> None:
+    """Tests that an unseen SMILES is reported as a miss."""
+    with SmilesCache(tmp_path / "smiles.sqlite") as cache:
+        assert cache.get("CCO") is None
+
+
+def test_invalid_smiles_is_cached(tmp_path: Path) -> None:
+    """Tests that invalid SMILES are remembered and keep raising on lookup."""
+    with SmilesCache(tmp_path / "smiles.sqlite") as cache:
+        with pytest.raises(InvalidSmilesError):
+            cache.canonicalize("this is not a smiles")
+        with pytest.raises(InvalidSmilesError):
+            cache.get("this is not a smiles")
+
+
+def test_empty_smiles_is_not_cached(tmp_path: Path) -> None:
+    """Tests that empty input raises without touching the cache."""
+    with SmilesCache(tmp_path / "smiles.sqlite") as cache:
+        with pytest.raises(InvalidSmilesError):
+            cache.canonicalize("")
+        assert cache.get("") is None
+
+
+def test_cache_persists_across_reopen(tmp_path: Path) -> None:
+    """Tests that entries written in one session are visible in the next."""
+    # Arrange
+    path = tmp_path / "nested" / "smiles.sqlite"
+    with SmilesCache(path) as cache:
+        cache.canonicalize("c1ccccc1O")
+
+    # Act
+    with SmilesCache(path) as cache:
+        canon = cache.get("c1ccccc1O")
+
+    # Assert
+    assert canon == "Oc1ccccc1"
+
+
+def test_cache_is_cleared_when_rdkit_version_changes(tmp_path: Path) -> None:
+    """Tests that entries written under another RDKit version are dropped on open."""
+    # Arrange: a cached, deliberately non-canonical entry, stamped with a different RDKit version
+    path = tmp_path / "smiles.sqlite"
+    with SmilesCache(path) as cache:
+        cache.put("OC(=O)c1ccccc1OC(C)=O", "OC(=O)c1ccccc1OC(C)=O")
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE meta SET value = '0.0.0' WHERE key = 'rdkit_version'")
+    conn.commit()
+    conn.close()
+
+    # Act
+    with SmilesCache(path) as cache:
+        stale = cache.get("OC(=O)c1ccccc1OC(C)=O")
+        canon = cache.canonicalize("OC(=O)c1ccccc1OC(C)=O")
+
+    # Assert
+    assert stale is None
+    assert canon == "CC(=O)Oc1ccccc1C(=O)O"
+
+
+def test_cache_without_version_stamp_is_cleared(tmp_path: Path) -> None:
+    """Tests that a cache file from before version tracking is treated as stale."""
+    # Arrange: a legacy file with only the cache table
+    path = tmp_path / "smiles.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE cache (raw TEXT PRIMARY KEY, canon TEXT, invalid INT NOT NULL)")
+    conn.execute("INSERT INTO cache VALUES ('OCC', 'OCC', 0)")
+    conn.commit()
+    conn.close()
+
+    # Act / Assert
+    with SmilesCache(path) as cache:
+        assert cache.get("OCC") is None
+
+
+def test_load_and_prepare_targets_uses_cache(tmp_path: Path) -> None:
+    """Tests that target preparation fills the cache when one is provided."""
+    # Arrange
+    targets_file = tmp_path / "targets.csv"
+    with targets_file.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Structure ID", "SMILES"])
+        writer.writerow(["target_abc", "OCC"])
+
+    # Act
+    with SmilesCache(tmp_path / "smiles.sqlite") as cache:
+        targets = load_and_prepare_targets(targets_file, cache)
+        cached = cache.get("OCC")
+
+    # Assert
+    assert targets["target_abc"].smiles == "CCO"
+    assert cached == "CCO"
+
+
+def test_load_and_prepare_targets_in_pool_fills_cache(tmp_path: Path) -> None:
+    """Tests that the process-pool path serves hits from the cache and records misses in it."""
+    # Arrange
+    targets_file = tmp_path / "targets.csv"
+    with targets_file.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Structure ID", "SMILES"])
+        writer.writerow(["target_abc", "OCC"])
+        writer.writerow(["target_xyz", "C1=CC=CC=C1"])
+
+    # Act
+    with SmilesCache(tmp_path / "smiles.sqlite") as cache:
+        cache.put("OCC", "CCO")
+        targets = load_and_prepare_targets(targets_file, cache, max_workers=2)
+        cached = cache.get("C1=CC=CC=C1")
+
+    # Assert
+    assert targets["target_abc"].smiles == "CCO"
+    assert targets["target_xyz"].smiles == "c1ccccc1"
+    assert cached == "c1ccccc1"
+
+
+def test_load_and_prepare_targets_skips_pool_on_warm_cache(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Tests that no worker processes are started when every target SMILES is already cached."""
+    # Arrange
+    targets_file = tmp_path / "targets.csv"
+    with targets_file.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Structure ID", "SMILES"])
+        writer.writerow(["target_abc", "OCC"])
+    pool = mocker.patch("ursa.io.ProcessPoolExecutor")
+
+    # Act
+    with SmilesCache(tmp_path / "smiles.sqlite") as cache:
+        cache.put("OCC", "CCO")
+        targets = load_and_prepare_targets(targets_file, cache, max_workers=2)
+
+    # Assert
+    assert targets["target_abc"].smiles == "CCO"
+    pool.assert_not_called()